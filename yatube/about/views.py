@@ -1,6 +1,9 @@
+from core.routers import read_from_replica
+from django.utils.decorators import method_decorator
 from django.views.generic.base import TemplateView
 
 
+@method_decorator(read_from_replica, name='dispatch')
 class AboutAuthorView(TemplateView):
     template_name = 'about/author.html'
 
@@ -15,6 +18,7 @@ class AboutAuthorView(TemplateView):
         return context
 
 
+@method_decorator(read_from_replica, name='dispatch')
 class AboutTechView(TemplateView):
     template_name = 'about/tech.html'
 
@@ -1,5 +1,12 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from core import signals  # noqa: F401
+        if settings.TEMPLATES_WARM_UP:
+            from core.template_cache import warm_up_templates
+            warm_up_templates()
@@ -0,0 +1,157 @@
+import asyncio
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# тело запроса больше этого размера уходит из памяти во временный файл
+BODY_MEMORY_LIMIT = 1024 * 1024
+
+
+class WsgiToAsgi:
+    """
+    ASGI-приложение поверх WSGI-приложения Django 2.2, где своих async
+    представлений нет. Медленные клиенты читаются и получают ответ в
+    цикле событий, а поток из ограниченного пула занят только на время
+    работы представления с базой.
+    """
+
+    def __init__(self, wsgi_application, max_workers):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='asgi'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        else:
+            raise ValueError(f'Неподдерживаемый тип: {scope["type"]}')
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        body = tempfile.SpooledTemporaryFile(max_size=BODY_MEMORY_LIMIT)
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                body.close()
+                return None
+            body.write(message.get('body', b''))
+            if not message.get('more_body', False):
+                body.seek(0)
+                return body
+
+    async def http(self, scope, receive, send):
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        loop = asyncio.get_running_loop()
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ]
+
+        def run():
+            result = self.wsgi_application(
+                build_environ(scope, body), start_response
+            )
+            # обычный ответ собирается сразу, без лишних переходов в пул;
+            # потоковый читается из пула по частям
+            if getattr(result, 'streaming', False):
+                return None, result
+            try:
+                return b''.join(result), None
+            finally:
+                close_result(result)
+
+        try:
+            content, stream = await loop.run_in_executor(self.executor, run)
+        finally:
+            body.close()
+        await send({
+            'type': 'http.response.start',
+            'status': response['status'],
+            'headers': response['headers'],
+        })
+        if stream is None:
+            await send({'type': 'http.response.body', 'body': content})
+        else:
+            await self.send_stream(stream, send)
+
+    async def send_stream(self, stream, send):
+        loop = asyncio.get_running_loop()
+        iterator = iter(stream)
+        try:
+            while True:
+                chunk = await loop.run_in_executor(
+                    self.executor, next, iterator, None
+                )
+                if chunk is None:
+                    break
+                if chunk:
+                    await send({
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True,
+                    })
+            await send({'type': 'http.response.body'})
+        finally:
+            await loop.run_in_executor(self.executor, close_result, stream)
+
+
+def close_result(result):
+    # Django отправляет request_finished и закрывает соединения с базой
+    # в close() ответа, поэтому он вызывается в том же потоке пула
+    if hasattr(result, 'close'):
+        result.close()
+
+
+def build_environ(scope, body):
+    """WSGI-окружение из ASGI scope по PEP 3333."""
+    script_name = scope.get('root_path', '')
+    path = scope['path']
+    if script_name and path.startswith(script_name):
+        path = path[len(script_name):]
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        if name in environ:
+            separator = '; ' if name == 'HTTP_COOKIE' else ','
+            value = f'{environ[name]}{separator}{value}'
+        environ[name] = value
+    return environ
@@ -0,0 +1,71 @@
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# собранные заранее файлы сжимаются максимально, ответы на лету - быстро
+STATIC_LEVELS = {'br': 11, 'gzip': 9}
+DYNAMIC_LEVELS = {'br': 4, 'gzip': 6}
+
+
+def supported_encodings():
+    """Кодировки в порядке предпочтения; br - если установлен brotli."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме явно запрещенных q=0."""
+    accepted = set()
+    for part in header.split(','):
+        name, _, params = part.partition(';')
+        quality = params.strip().replace(' ', '')
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def negotiate(request):
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    for encoding in supported_encodings():
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def compress(content, encoding, levels=DYNAMIC_LEVELS):
+    if encoding == 'gzip':
+        # mtime=0: одинаковое содержимое дает одинаковые байты
+        return gzip.compress(content, compresslevel=levels['gzip'], mtime=0)
+    return brotli.compress(content, quality=levels['br'])
+
+
+def compress_chunks(chunks, encoding, levels=DYNAMIC_LEVELS):
+    """
+    Сжимает поток частей, сбрасывая сжатое после каждой части, чтобы
+    клиент получал данные по мере готовности.
+    """
+    if encoding == 'gzip':
+        # wbits 16 + MAX_WBITS - формат gzip, а не голый zlib
+        compressor = zlib.compressobj(levels['gzip'], zlib.DEFLATED,
+                                      16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+        return
+    compressor = brotli.Compressor(quality=levels['br'])
+    for chunk in chunks:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
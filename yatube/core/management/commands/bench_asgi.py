@@ -0,0 +1,104 @@
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.asgi import WsgiToAsgi
+from core.timing import percentiles
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test import override_settings
+from django.urls import reverse
+from posts.benchmarks import benchmark_database, call_wsgi, seed_dataset
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность WSGI и ASGI при множестве '
+            'медленных клиентов и одинаковом числе потоков. Синхронный '
+            'сервер держит поток, пока клиент передает запрос и читает '
+            'ответ; ASGI занимает поток только на время представления.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=200)
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--client-delay', type=float, default=0.05,
+                            help='Секунд на передачу запроса и ответа.')
+        parser.add_argument('--posts', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        test_name = os.path.join(
+            tempfile.gettempdir(), f'yatube_bench_{os.getpid()}.sqlite3'
+        )
+        with benchmark_database(test_name=test_name), override_settings(
+            DEBUG=False, ALLOWED_HOSTS=['127.0.0.1', 'localhost'],
+        ):
+            seed_dataset(users=10, groups=2, posts=options['posts'])
+            path = reverse('posts:index')
+            for name, run in (('WSGI', self.run_wsgi),
+                              ('ASGI', self.run_asgi)):
+                elapsed, latencies = run(path, options)
+                cuts = percentiles(latencies)
+                self.stdout.write(
+                    f'{name}: {options["clients"] / elapsed:7.1f} запр/с, '
+                    f'p50 {cuts["p50"]:7.1f} мс, p95 {cuts["p95"]:7.1f} мс'
+                )
+
+    def run_wsgi(self, path, options):
+        application = get_wsgi_application()
+        delay = options['client_delay']
+
+        def client(_):
+            time.sleep(delay / 2)
+            status, _, _ = call_wsgi(application, 'GET', path)
+            time.sleep(delay / 2)
+            if status != 200:
+                raise CommandError(f'WSGI: ответ {status}.')
+            return (time.perf_counter() - started) * 1000
+
+        # все клиенты подключаются сразу, ожидание потока входит в задержку
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['threads']) as pool:
+            latencies = list(pool.map(client, range(options['clients'])))
+        return time.perf_counter() - started, latencies
+
+    def run_asgi(self, path, options):
+        application = WsgiToAsgi(
+            get_wsgi_application(), max_workers=options['threads']
+        )
+        delay = options['client_delay']
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': path,
+            'query_string': b'', 'headers': [],
+            'server': ('localhost', 80),
+        }
+
+        async def client():
+            status = []
+
+            async def receive():
+                await asyncio.sleep(delay / 2)
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+                elif not message.get('more_body'):
+                    await asyncio.sleep(delay / 2)
+
+            await application(scope, receive, send)
+            if status != [200]:
+                raise CommandError(f'ASGI: ответ {status}.')
+            return (time.perf_counter() - started) * 1000
+
+        async def run_clients():
+            return await asyncio.gather(
+                *(client() for _ in range(options['clients']))
+            )
+
+        started = time.perf_counter()
+        try:
+            latencies = asyncio.run(run_clients())
+        finally:
+            application.executor.shutdown()
+        return time.perf_counter() - started, latencies
@@ -0,0 +1,56 @@
+from core.template_profiler import profile_templates
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Запрашивает страницы в этом процессе и показывает время '
+            'отрисовки по шаблонам и по цепочкам {% include %}.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+', help='Адреса страниц.')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--username',
+                            help='Запрашивать от имени пользователя.')
+        parser.add_argument('--cold', action='store_true',
+                            help='Очищать кэш карточек перед запросом.')
+        parser.add_argument('--paths', action='store_true',
+                            help='Показать цепочки вложенных шаблонов.')
+
+    def handle(self, *args, **options):
+        client = Client()
+        if options['username']:
+            try:
+                client.force_login(
+                    User.objects.get(username=options['username'])
+                )
+            except User.DoesNotExist:
+                raise CommandError('Нет такого пользователя.')
+        with override_settings(ALLOWED_HOSTS=['testserver']), \
+                profile_templates() as profile:
+            for _ in range(options['repeat']):
+                for url in options['urls']:
+                    if options['cold']:
+                        caches['posts'].clear()
+                    response = client.get(url)
+                    if response.status_code != 200:
+                        raise CommandError(
+                            f'{url}: ответ {response.status_code}.'
+                        )
+
+        repeat = options['repeat']
+        rows = profile.by_path() if options['paths'] else profile.by_template()
+        width = max(len(row[0]) for row in rows)
+        self.stdout.write(
+            f'{"шаблон":<{width}} {"вызовов":>8} {"всего, мс":>10} '
+            f'{"свое, мс":>10}   (на один проход)'
+        )
+        for name, calls, total, own in rows:
+            self.stdout.write(
+                f'{name:<{width}} {calls / repeat:8.1f} '
+                f'{total / repeat:10.3f} {own / repeat:10.3f}'
+            )
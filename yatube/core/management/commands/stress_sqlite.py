@@ -0,0 +1,122 @@
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode
+
+from core.timing import percentiles
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import override_settings
+from django.urls import reverse
+from posts.benchmarks import (auth_headers, benchmark_database, call_wsgi,
+                              seed_dataset)
+
+User = get_user_model()
+
+# настройки до профиля: соединение на запрос, журнал DELETE
+PROFILES = {
+    'прежний': {
+        'OPTIONS': {},
+        'CONN_MAX_AGE': 0,
+        'SQLITE_PRAGMAS': {'journal_mode': 'DELETE', 'synchronous': 'FULL'},
+    },
+    'настроенный': {
+        **settings.SQLITE_PRODUCTION,
+        'SQLITE_PRAGMAS': {
+            **settings.SQLITE_PRODUCTION_PRAGMAS, **settings.SQLITE_PRAGMAS
+        },
+    },
+}
+
+
+class Command(BaseCommand):
+    help = ('Параллельно читает ленту и создает посты через WSGI-приложение '
+            'при прежних и настроенных параметрах SQLite и сравнивает '
+            'ошибки блокировок и время ответа.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=10.0)
+        parser.add_argument('--posts', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        from yatube.wsgi import application
+
+        database = connections.databases['default']
+        saved = {name: database.get(name) for name in ('OPTIONS',
+                                                       'CONN_MAX_AGE')}
+        try:
+            for name, profile in PROFILES.items():
+                database['OPTIONS'] = profile['OPTIONS']
+                database['CONN_MAX_AGE'] = profile['CONN_MAX_AGE']
+                with override_settings(
+                    SQLITE_PRAGMAS=profile['SQLITE_PRAGMAS'],
+                    DEBUG=False, ALLOWED_HOSTS=['127.0.0.1'],
+                ):
+                    self.report(name, self.stress(application, options))
+        finally:
+            database.update(saved)
+
+    def stress(self, application, options):
+        test_name = os.path.join(
+            tempfile.gettempdir(), f'yatube_stress_{os.getpid()}.sqlite3'
+        )
+        with benchmark_database(test_name=test_name):
+            author_ids, _ = seed_dataset(
+                users=10, groups=2, posts=options['posts']
+            )
+            headers = auth_headers(User.objects.get(pk=author_ids[0]))
+            body = urlencode({'text': 'Пост из стресс-теста'}).encode()
+            deadline = time.perf_counter() + options['duration']
+            results = defaultdict(list)
+            errors = defaultdict(int)
+            lock = threading.Lock()
+
+            def worker(kind, method, path, body=b'', headers=None):
+                while time.perf_counter() < deadline:
+                    status, latency, _ = call_wsgi(
+                        application, method, path, body, headers
+                    )
+                    with lock:
+                        results[kind].append(latency)
+                        if status >= 500:
+                            errors[kind] += 1
+                connections.close_all()
+
+            threads = [
+                threading.Thread(
+                    target=worker,
+                    args=('чтение', 'GET', reverse('posts:index')),
+                )
+                for _ in range(options['readers'])
+            ] + [
+                threading.Thread(
+                    target=worker,
+                    args=('запись', 'POST', reverse('posts:post_create'),
+                          body, headers),
+                )
+                for _ in range(options['writers'])
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return {
+            kind: (len(latencies), errors[kind],
+                   percentiles(latencies))
+            for kind, latencies in results.items()
+        }
+
+    def report(self, name, results):
+        self.stdout.write(f'Профиль «{name}»:')
+        for kind, (count, errors, cuts) in sorted(results.items()):
+            self.stdout.write(
+                f'  {kind:<7} {count:6} запросов, ошибок {errors:4}, '
+                f'p50 {cuts["p50"]:7.1f} мс, p95 {cuts["p95"]:7.1f} мс, '
+                f'p99 {cuts["p99"]:7.1f} мс'
+            )
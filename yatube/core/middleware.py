@@ -0,0 +1,57 @@
+from contextlib import ExitStack
+
+from core import timing
+from core.routers import PIN_COOKIE
+from django.conf import settings
+from django.db import connections
+
+
+class PinPrimaryAfterWriteMiddleware:
+    """
+    После запроса с записью ставит cookie, и следующие запросы этого
+    посетителя читают с основной базы, пока реплики догоняют ее.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            settings.READ_REPLICAS
+            and request.method not in ('GET', 'HEAD', 'OPTIONS')
+        ):
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+            )
+        return response
+
+
+class RequestTimingMiddleware:
+    """
+    Считает SQL-запросы, время базы, шаблонов и всего запроса, отдает
+    их в заголовке Server-Timing и копит по имени URL для /internal/.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        timing.install_template_timing()
+
+    def __call__(self, request):
+        if not settings.REQUEST_TIMING_ENABLED:
+            return self.get_response(request)
+        timer = timing.start_timer()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            timing.stop_timer()
+        timings = timer.finish()
+        match = request.resolver_match
+        timing.record(match.view_name if match else '-', timings)
+        response['Server-Timing'] = timing.server_timing(timings)
+        return response
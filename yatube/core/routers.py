@@ -0,0 +1,67 @@
+import random
+import threading
+from functools import wraps
+
+from django.conf import settings
+
+PIN_COOKIE = 'db_pinned'
+
+_state = threading.local()
+
+
+def current_replica():
+    return getattr(_state, 'replica', None)
+
+
+class ReplicaRouter:
+    """
+    Чтение внутри представлений с read_from_replica идет на реплику,
+    запись и все остальное чтение - на основную базу.
+    """
+
+    primary = 'default'
+
+    def db_for_read(self, model, **hints):
+        # сессии читаются с основной базы: реплика может отставать
+        if model._meta.app_label == 'sessions':
+            return self.primary
+        return current_replica() or self.primary
+
+    def db_for_write(self, model, **hints):
+        return self.primary
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {self.primary, *settings.READ_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+
+def replica_for(request):
+    """Реплика для запроса или None, если читать нужно с основной базы."""
+    if (
+        not settings.READ_REPLICAS
+        or request.method not in ('GET', 'HEAD')
+        or PIN_COOKIE in request.COOKIES
+    ):
+        return None
+    return random.choice(settings.READ_REPLICAS)
+
+
+def read_from_replica(view):
+    """Направляет чтение представления на случайную реплику."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        replica = replica_for(request)
+        if replica is None:
+            return view(request, *args, **kwargs)
+        _state.replica = replica
+        try:
+            response = view(request, *args, **kwargs)
+            # TemplateResponse отрисовывается после выхода из представления
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+        finally:
+            _state.replica = None
+    return wrapper
@@ -0,0 +1,68 @@
+import mimetypes
+import os
+import posixpath
+
+from core.compression import accepted_encodings, supported_encodings
+from core.storage import SUFFIXES
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def choose_variant(request, fullpath):
+    """Заранее сжатая копия файла, которую пишет core.storage."""
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    for encoding in supported_encodings():
+        suffix = SUFFIXES[encoding]
+        if encoding in accepted and os.path.isfile(fullpath + suffix):
+            return encoding, fullpath + suffix
+    return None, fullpath
+
+
+def is_immutable(path):
+    check = getattr(staticfiles_storage, 'is_immutable', None)
+    return check is not None and check(path)
+
+
+@require_safe
+def serve(request, path):
+    """
+    Раздает файлы из STATIC_ROOT, когда перед приложением нет прокси:
+    заранее сжатую копию по Accept-Encoding и долгий кэш для имен с
+    хэшем. FileResponse отдается через wsgi.file_wrapper, и сервер
+    вроде gunicorn передает файл через sendfile без копирования.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(fullpath):
+        raise Http404
+    encoding, served = choose_variant(request, fullpath)
+    stat = os.stat(served)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'),
+                              stat.st_mtime, stat.st_size):
+        return HttpResponseNotModified()
+    content_type, _ = mimetypes.guess_type(fullpath)
+    response = FileResponse(
+        open(served, 'rb'),
+        content_type=content_type or 'application/octet-stream',
+    )
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Cache-Control'] = (
+        IMMUTABLE if is_immutable(path)
+        else f'public, max-age={settings.STATIC_MAX_AGE}'
+    )
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
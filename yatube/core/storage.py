@@ -0,0 +1,45 @@
+from core.compression import STATIC_LEVELS, compress, supported_encodings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.utils.functional import cached_property
+
+# сжимать есть смысл только текст: картинки уже сжаты своим форматом
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.ico', '.json', '.txt', '.xml', '.map',
+)
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Имена файлов с хэшем содержимого и манифест, а рядом с текстовыми
+    файлами - заранее сжатые копии .gz и .br (если установлен brotli).
+    Копия сохраняется, только если она меньше исходного файла.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            with self.open(name) as source:
+                content = source.read()
+            for encoding in supported_encodings():
+                suffix = SUFFIXES[encoding]
+                compressed = compress(content, encoding, STATIC_LEVELS)
+                if len(compressed) >= len(content):
+                    continue
+                if self.exists(name + suffix):
+                    self.delete(name + suffix)
+                self._save(name + suffix, ContentFile(compressed))
+                yield name, name + suffix, True
+
+    @cached_property
+    def immutable_names(self):
+        return frozenset(self.hashed_files.values())
+
+    def is_immutable(self, name):
+        """Имя с хэшем меняется вместе с содержимым файла."""
+        return name in self.immutable_names
@@ -0,0 +1,29 @@
+import os
+
+from django.template import engines
+
+
+def project_template_names(engine):
+    for directory in engine.engine.dirs:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith('.html'):
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, directory).replace(
+                        os.sep, '/'
+                    )
+
+
+def warm_up_templates():
+    """
+    Загружает шаблоны проекта заранее: с кэширующим загрузчиком первые
+    запросы не тратят время на разбор шаблонов.
+    """
+    loaded = 0
+    for engine in engines.all():
+        if not hasattr(engine, 'engine'):
+            continue
+        for name in project_template_names(engine):
+            engine.get_template(name)
+            loaded += 1
+    return loaded
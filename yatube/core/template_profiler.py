@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.template.base import Template
+
+_local = threading.local()
+
+
+class TemplateProfile:
+    """
+    Время отрисовки по цепочкам шаблонов: ключ - кортеж имен от внешнего
+    шаблона до вложенного через {% include %} или {% extends %}.
+    """
+
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.total = defaultdict(float)
+        self.own = defaultdict(float)
+        self.stack = []
+
+    def enter(self, name):
+        self.stack.append([name, time.perf_counter(), 0.0])
+
+    def leave(self):
+        name, started, children = self.stack.pop()
+        elapsed = time.perf_counter() - started
+        path = tuple(frame[0] for frame in self.stack) + (name,)
+        self.calls[path] += 1
+        self.total[path] += elapsed
+        self.own[path] += elapsed - children
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def by_template(self):
+        """Строки (имя, вызовы, всего мс, собственное мс) по убыванию."""
+        rows = defaultdict(lambda: [0, 0.0, 0.0])
+        for path, calls in self.calls.items():
+            row = rows[path[-1]]
+            row[0] += calls
+            # вложенный в себя шаблон не считается дважды
+            if path[-1] not in path[:-1]:
+                row[1] += self.total[path] * 1000
+            row[2] += self.own[path] * 1000
+        return sorted(
+            ((name, *row) for name, row in rows.items()),
+            key=lambda row: row[3], reverse=True,
+        )
+
+    def by_path(self):
+        """Строки (цепочка, вызовы, всего мс, собственное мс)."""
+        return sorted(
+            (
+                (' > '.join(path), self.calls[path],
+                 self.total[path] * 1000, self.own[path] * 1000)
+                for path in self.calls
+            ),
+            key=lambda row: row[2], reverse=True,
+        )
+
+
+def install():
+    if getattr(Template._render, 'profiled', False):
+        return
+    render = Template._render
+
+    def profiled_render(self, context):
+        profile = getattr(_local, 'profile', None)
+        if profile is None:
+            return render(self, context)
+        profile.enter(self.origin.template_name or self.origin.name)
+        try:
+            return render(self, context)
+        finally:
+            profile.leave()
+
+    profiled_render.profiled = True
+    Template._render = profiled_render
+
+
+@contextmanager
+def profile_templates():
+    """Собирает время шаблонов, отрисованных в этом потоке внутри блока."""
+    install()
+    profile = TemplateProfile()
+    _local.profile = profile
+    try:
+        yield profile
+    finally:
+        _local.profile = None
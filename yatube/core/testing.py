@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TestCase
+
+
+class CommitCallbacksTestCase(TestCase):
+    """
+    TestCase с captureOnCommitCallbacks() из Django 3.2: TestCase не
+    фиксирует транзакцию, и функции transaction.on_commit() без него не
+    выполняются. После перехода на Django 3.2 класс можно удалить.
+    """
+
+    @classmethod
+    @contextmanager
+    def captureOnCommitCallbacks(cls, *, using=DEFAULT_DB_ALIAS,
+                                 execute=False):
+        """Собирает функции on_commit() блока и с execute выполняет их."""
+        callbacks = []
+        start_count = len(connections[using].run_on_commit)
+        try:
+            yield callbacks
+        finally:
+            run_on_commit = connections[using].run_on_commit[start_count:]
+            callbacks[:] = [func for _, func in run_on_commit]
+            if execute:
+                for callback in callbacks:
+                    callback()
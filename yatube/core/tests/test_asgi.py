@@ -0,0 +1,101 @@
+import asyncio
+
+from core.asgi import WsgiToAsgi
+from django.core.wsgi import get_wsgi_application
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+def echo_application(environ, start_response):
+    body = environ['wsgi.input'].read()
+    start_response('201 Created', [('X-Path', environ['PATH_INFO'])])
+    return [
+        environ['QUERY_STRING'].encode(), b'|',
+        environ.get('HTTP_COOKIE', '').encode(), b'|', body,
+    ]
+
+
+class StreamingResult:
+    streaming = True
+
+    def __init__(self):
+        self.closed = False
+
+    def __iter__(self):
+        yield b'first'
+        yield b'second'
+
+    def close(self):
+        self.closed = True
+
+
+def call(application, scope, chunks=(b'',)):
+    messages = [
+        {'type': 'http.request', 'body': chunk, 'more_body': True}
+        for chunk in chunks[:-1]
+    ] + [{'type': 'http.request', 'body': chunks[-1]}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        await application({'type': 'http', 'query_string': b'',
+                           'headers': [], **scope}, receive, send)
+
+    asyncio.run(run())
+    return sent
+
+
+@override_settings(ALLOWED_HOSTS=['localhost'])
+class AsgiAdapterTests(TestCase):
+    def setUp(self):
+        self.application = WsgiToAsgi(echo_application, max_workers=2)
+        self.addCleanup(self.application.executor.shutdown)
+
+    def test_request_is_translated_to_environ(self):
+        """Проверка передачи пути, запроса, cookie и тела по частям."""
+        sent = call(self.application, {
+            'method': 'POST',
+            'path': '/посты/',
+            'query_string': b'page=2',
+            'headers': [(b'cookie', b'a=1'), (b'cookie', b'b=2')],
+        }, chunks=(b'part1,', b'part2'))
+        start, body = sent
+        self.assertEqual(start['status'], 201)
+        self.assertIn(
+            (b'x-path', '/посты/'.encode('utf-8')), start['headers']
+        )
+        self.assertEqual(body['body'], b'page=2|a=1; b=2|part1,part2')
+
+    def test_streaming_response_is_sent_in_chunks(self):
+        """Проверка потоковой отдачи ответа по частям с закрытием."""
+        result = StreamingResult()
+
+        def streaming_application(environ, start_response):
+            start_response('200 OK', [])
+            return result
+
+        application = WsgiToAsgi(streaming_application, max_workers=2)
+        self.addCleanup(application.executor.shutdown)
+        sent = call(application, {'method': 'GET', 'path': '/'})
+        self.assertEqual(
+            [message.get('body') for message in sent[1:]],
+            [b'first', b'second', None],
+        )
+        self.assertTrue(result.closed)
+
+    def test_django_page_is_served(self):
+        """Проверка, отдает ли ASGI-вход страницу Django."""
+        application = WsgiToAsgi(get_wsgi_application(), max_workers=2)
+        self.addCleanup(application.executor.shutdown)
+        start, body = call(application, {
+            'method': 'GET',
+            'path': reverse('about:author'),
+            'server': ('localhost', 80),
+        })
+        self.assertEqual(start['status'], 200)
+        self.assertIn('Привет, я автор'.encode(), body['body'])
@@ -0,0 +1,66 @@
+from core.routers import PIN_COOKIE, ReplicaRouter, read_from_replica
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from posts.models import Post
+
+User = get_user_model()
+
+REPLICAS = ['replica1', 'replica2']
+
+
+@read_from_replica
+def routed_view(request):
+    router = ReplicaRouter()
+    return HttpResponse('|'.join((
+        router.db_for_read(Post),
+        router.db_for_write(Post),
+        router.db_for_read(Session),
+    )))
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+class ReplicaRouterTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+
+    def route(self, request):
+        return routed_view(request).content.decode().split('|')
+
+    def test_get_reads_from_replica(self):
+        """Проверка, читает ли GET-представление с реплики."""
+        read, write, session = self.route(self.factory.get('/'))
+        self.assertIn(read, REPLICAS)
+        self.assertEqual(write, 'default')
+        self.assertEqual(session, 'default')
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_writes_and_pinned_reads_use_primary(self):
+        """Проверка, идет ли на основную базу POST и чтение после записи."""
+        pinned = self.factory.get('/')
+        pinned.COOKIES[PIN_COOKIE] = '1'
+        for request in (self.factory.post('/'), pinned):
+            with self.subTest(method=request.method):
+                self.assertEqual(self.route(request)[0], 'default')
+
+    @override_settings(READ_REPLICAS=[])
+    def test_without_replicas_reads_use_primary(self):
+        """Проверка, читает ли все с основной базы без реплик."""
+        self.assertEqual(self.route(self.factory.get('/'))[0], 'default')
+
+    def test_write_pins_visitor_to_primary(self):
+        """Проверка, ставится ли после записи cookie чтения с основной базы."""
+        user = User.objects.create_user(username='author')
+        client = Client()
+        client.force_login(user)
+        response = client.post(
+            reverse('posts:post_create'), data={'text': 'Новый пост'}
+        )
+        self.assertIn(PIN_COOKIE, response.cookies)
+        response = client.get(
+            reverse('posts:profile', kwargs={'username': user.username})
+        )
+        self.assertContains(response, 'Новый пост')
@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+
+class SqlitePragmasTests(SimpleTestCase):
+    def connection_pragmas(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        wrapper = DatabaseWrapper({
+            **connection.settings_dict,
+            'NAME': os.path.join(directory.name, 'test.sqlite3'),
+        })
+        self.addCleanup(wrapper.close)
+        with wrapper.cursor() as cursor:
+            pragmas = {}
+            for name in ('journal_mode', 'synchronous', 'cache_size'):
+                cursor.execute(f'PRAGMA {name}')
+                pragmas[name] = cursor.fetchone()[0]
+        return pragmas
+
+    def test_new_connection_gets_pragmas(self):
+        """Проверка, включаются ли прагмы на новом соединении без WAL."""
+        self.assertEqual(self.connection_pragmas(), {
+            'journal_mode': 'delete',
+            'synchronous': 2,
+            'cache_size': settings.SQLITE_PRAGMAS['cache_size'],
+        })
+
+    @override_settings(SQLITE_PRAGMAS={
+        **settings.SQLITE_PRODUCTION_PRAGMAS, **settings.SQLITE_PRAGMAS
+    })
+    def test_production_connection_gets_wal(self):
+        """Проверка, включаются ли WAL и прагмы продакшена."""
+        self.assertEqual(self.connection_pragmas(), {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'cache_size': settings.SQLITE_PRAGMAS['cache_size'],
+        })
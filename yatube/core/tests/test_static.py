@@ -0,0 +1,100 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+from core import static
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import Http404
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+STATIC_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    STATIC_ROOT=STATIC_ROOT,
+    STATICFILES_STORAGE='core.storage.CompressedManifestStaticFilesStorage',
+)
+class StaticPipelineTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.css = staticfiles_storage.stored_name('css/bootstrap.min.css')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(STATIC_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def get(self, path, **headers):
+        request = RequestFactory().get(f'/static/{path}', **headers)
+        return static.serve(request, path)
+
+    def test_collectstatic_writes_hashed_names_and_manifest(self):
+        """Проверка, что файлы получают хэш в имени и попадают в манифест."""
+        self.assertNotEqual(self.css, 'css/bootstrap.min.css')
+        with open(os.path.join(STATIC_ROOT, 'staticfiles.json')) as stream:
+            manifest = json.load(stream)
+        self.assertEqual(manifest['paths']['css/bootstrap.min.css'], self.css)
+
+    def test_collectstatic_writes_gzip_copies(self):
+        """Проверка, что рядом с текстом лежит сжатая копия, а с png нет."""
+        original = os.path.join(STATIC_ROOT, self.css)
+        with open(original, 'rb') as source, \
+                gzip.open(original + '.gz') as compressed:
+            self.assertEqual(compressed.read(), source.read())
+        logo = staticfiles_storage.stored_name('img/logo.png')
+        self.assertFalse(os.path.exists(os.path.join(STATIC_ROOT,
+                                                     logo + '.gz')))
+
+    def test_static_tag_uses_hashed_name(self):
+        """Проверка, что {% static %} выдает имя с хэшем."""
+        html = Template(
+            "{% load static %}{% static 'css/bootstrap.min.css' %}"
+        ).render(Context())
+        self.assertEqual(html, settings.STATIC_URL + self.css)
+
+    def test_serve_precompressed_immutable(self):
+        """Проверка, что сжатая копия отдается с вечным кэшем."""
+        response = self.get(self.css, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Cache-Control'], static.IMMUTABLE)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        body = gzip.decompress(b''.join(response.streaming_content))
+        with open(os.path.join(STATIC_ROOT, self.css), 'rb') as source:
+            self.assertEqual(body, source.read())
+
+    def test_serve_without_accept_encoding(self):
+        """Проверка, что без Accept-Encoding отдается исходный файл."""
+        response = self.get(self.css)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.get(self.css, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_serve_unhashed_name_short_cache(self):
+        """Проверка, что у имени без хэша короткий срок кэша."""
+        response = self.get('css/bootstrap.min.css')
+        self.assertEqual(
+            response['Cache-Control'],
+            f'public, max-age={settings.STATIC_MAX_AGE}',
+        )
+
+    def test_serve_not_modified(self):
+        """Проверка, что If-Modified-Since дает 304."""
+        response = self.get(self.css)
+        response = self.get(
+            self.css, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_serve_missing_and_outside_root(self):
+        """Проверка, что нет доступа к отсутствующим и внешним файлам."""
+        for path in ('css/missing.css', '../settings.py', '/etc/passwd'):
+            with self.subTest(path=path), self.assertRaises(Http404):
+                self.get(path)
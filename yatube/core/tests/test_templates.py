@@ -0,0 +1,63 @@
+from core.template_cache import warm_up_templates
+from core.template_profiler import profile_templates
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.template import engines
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from posts.models import Post
+
+User = get_user_model()
+
+CACHED_TEMPLATES = [{
+    **settings.TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **settings.TEMPLATES[0]['OPTIONS'],
+        'loaders': [(
+            'django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ],
+        )],
+    },
+}]
+
+
+class TemplatesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        for number in range(3):
+            Post.objects.create(text=f'Пост {number}', author=cls.user)
+
+    @override_settings(TEMPLATES=CACHED_TEMPLATES)
+    def test_warm_up_fills_cached_loader(self):
+        """Проверка, попадают ли шаблоны проекта в кэш загрузчика."""
+        self.assertGreater(warm_up_templates(), 0)
+        loader = engines['django'].engine.template_loaders[0]
+        cached = {
+            template.origin.template_name
+            for template in loader.get_template_cache.values()
+        }
+        self.assertTrue({
+            'posts/index.html', 'includes/post_item.html',
+            'includes/paginator.html',
+        } <= cached)
+
+    def test_profiler_reports_includes(self):
+        """Проверка, видит ли профилировщик вложенные шаблоны."""
+        caches['posts'].clear()
+        with profile_templates() as profile:
+            Client().get(reverse('posts:index'))
+        templates = {row[0]: row for row in profile.by_template()}
+        self.assertEqual(templates['includes/post_item.html'][1], 3)
+        self.assertEqual(templates['posts/index.html'][1], 1)
+        paths = {row[0] for row in profile.by_path()}
+        self.assertIn(
+            'posts/index.html > base.html > includes/nav.html', paths
+        )
+        index = templates['posts/index.html']
+        self.assertGreaterEqual(index[2], index[3])
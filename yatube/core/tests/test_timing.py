@@ -0,0 +1,68 @@
+import re
+
+from core import timing
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from posts.models import Post
+
+User = get_user_model()
+
+
+class RequestTimingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        Post.objects.create(text='Тестовый пост', author=cls.user)
+
+    def setUp(self):
+        timing.reset()
+        self.guest_client = Client()
+
+    def test_server_timing_header(self):
+        """Проверка заголовка Server-Timing с числом запросов и временем."""
+        response = self.guest_client.get(reverse('posts:index'))
+        header = response['Server-Timing']
+        self.assertRegex(header, r'db;dur=[\d.]+;desc="\d+ SQL"')
+        self.assertRegex(header, r'tpl;dur=[\d.]+')
+        self.assertRegex(header, r'total;dur=[\d.]+')
+        queries = int(re.search(r'"(\d+) SQL"', header).group(1))
+        self.assertGreater(queries, 0)
+
+    def test_stats_are_grouped_by_url_name(self):
+        """Проверка перцентилей по имени URL во внутреннем адресе."""
+        for _ in range(3):
+            self.guest_client.get(reverse('posts:index'))
+        self.guest_client.get(reverse('about:author'))
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        client = Client()
+        client.force_login(staff)
+        stats = client.get(reverse('request_timings')).json()
+        self.assertEqual(stats['posts:index']['count'], 3)
+        self.assertEqual(stats['about:author']['count'], 1)
+        for metric in timing.METRICS:
+            with self.subTest(metric=metric):
+                self.assertEqual(
+                    set(stats['posts:index'][metric]), {'p50', 'p95', 'p99'}
+                )
+        self.assertGreater(stats['about:author']['template']['p50'], 0)
+
+    def test_stats_are_staff_only(self):
+        """Проверка, закрыт ли внутренний адрес от посетителей."""
+        response = self.guest_client.get(reverse('request_timings'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_percentiles_interpolate(self):
+        """Проверка перцентилей с интерполяцией между значениями."""
+        self.assertEqual(
+            timing.percentiles([40, 10, 30, 20, 50]),
+            {'p50': 30, 'p95': 48, 'p99': 49.6},
+        )
+        self.assertEqual(timing.percentiles([7])['p99'], 7)
+
+    @override_settings(REQUEST_TIMING_ENABLED=False)
+    def test_timing_can_be_disabled(self):
+        """Проверка отключения замеров настройкой."""
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertFalse(response.has_header('Server-Timing'))
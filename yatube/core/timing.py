@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.template.base import Template
+
+METRICS = ('total', 'db', 'template', 'queries')
+
+_local = threading.local()
+_lock = threading.Lock()
+_samples = {}
+
+
+class RequestTimer:
+    """Счетчики одного запроса: SQL-запросы, время базы и шаблонов."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.template = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def finish(self):
+        return {
+            'total': (time.perf_counter() - self.started) * 1000,
+            'db': self.db * 1000,
+            'template': self.template * 1000,
+            'queries': self.queries,
+        }
+
+
+def current_timer():
+    return getattr(_local, 'timer', None)
+
+
+def start_timer():
+    _local.timer = RequestTimer()
+    return _local.timer
+
+
+def stop_timer():
+    _local.timer = None
+
+
+def install_template_timing():
+    """
+    Оборачивает Template.render: время считается только у внешнего
+    шаблона, вложенные include в нем уже учтены.
+    """
+    if getattr(Template.render, 'timed', False):
+        return
+    render = Template.render
+
+    def timed_render(self, context):
+        timer = current_timer()
+        if timer is None:
+            return render(self, context)
+        timer.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            timer.template_depth -= 1
+            if not timer.template_depth:
+                timer.template += time.perf_counter() - started
+
+    timed_render.timed = True
+    Template.render = timed_render
+
+
+def record(view_name, timings):
+    with _lock:
+        if view_name not in _samples:
+            _samples[view_name] = defaultdict(
+                lambda: deque(maxlen=settings.REQUEST_TIMING_SAMPLES)
+            )
+        for metric, value in timings.items():
+            _samples[view_name][metric].append(value)
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+
+
+def percentile(ordered, percent):
+    """Перцентиль упорядоченного списка с интерполяцией между соседями."""
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+        position - lower
+    )
+
+
+def percentiles(values):
+    """p50, p95 и p99; statistics.quantiles появился только в Python 3.8."""
+    if not values:
+        return {'p50': 0, 'p95': 0, 'p99': 0}
+    ordered = sorted(values)
+    return {
+        f'p{percent}': percentile(ordered, percent)
+        for percent in (50, 95, 99)
+    }
+
+
+def timing_stats():
+    """Перцентили метрик по имени URL за последние запросы процесса."""
+    with _lock:
+        snapshot = {
+            view_name: {metric: list(values) for metric, values in
+                        metrics.items()}
+            for view_name, metrics in _samples.items()
+        }
+    return {
+        view_name: {
+            'count': len(metrics['total']),
+            **{
+                metric: percentiles(metrics[metric])
+                for metric in METRICS
+            },
+        }
+        for view_name, metrics in sorted(snapshot.items())
+    }
+
+
+def server_timing(timings):
+    return (
+        f'db;dur={timings["db"]:.1f};desc="{timings["queries"]} SQL", '
+        f'tpl;dur={timings["template"]:.1f}, '
+        f'total;dur={timings["total"]:.1f}'
+    )
@@ -0,0 +1,8 @@
+from core.timing import timing_stats
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+
+@staff_member_required
+def request_timings(request):
+    return JsonResponse(timing_stats(), json_dumps_params={'indent': 2})
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from .models import Post, Group
+from .search import get_backend
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -11,9 +12,15 @@ class PostAdmin(admin.ModelAdmin):
     list_editable = ('group',)
     empty_value_display = '-пусто-'
 
+    def get_search_results(self, request, queryset, search_term):
+        # поиск по индексу вместо LIKE '%...%' по всей таблице
+        if not search_term.strip():
+            return queryset, False
+        return get_backend().filter_queryset(queryset, search_term), False
+
 
 class GroupAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'title', 'slug', 'description')
+    list_display = ('pk', 'title', 'slug', 'description', 'posts_count')
     list_editable = ('slug',)
     list_display_links = ('title',)
     empty_value_display = '-пусто-'
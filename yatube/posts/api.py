@@ -0,0 +1,280 @@
+import json
+from functools import wraps
+
+from core.compression import compress, compress_chunks, negotiate
+from core.routers import read_from_replica
+from django.conf import settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import condition, require_safe
+from posts.cards import render_post_cards
+from posts.conditions import (feed_etag, feed_last_modified, make_etag,
+                              post_etag)
+from posts.lookups import author_by_username, group_by_slug
+from posts.models import MAX_ID, Post
+from posts.paginators import CursorPaginator, decode_cursor
+
+# поле ответа: (колонки для only(), значение из поста)
+API_FIELDS = {
+    'id': ((), lambda post: post.pk),
+    'text': (('text',), lambda post: post.text),
+    'pub_date': ((), lambda post: post.pub_date.isoformat()),
+    'author': (('author__username',), lambda post: post.author.username),
+    'group': (
+        ('group__slug',),
+        lambda post: post.group.slug if post.group_id else None,
+    ),
+}
+API_CONTENT_TYPE = 'application/json'
+# сжимать короче этого нет смысла: заголовки gzip съедят выигрыш
+COMPRESS_MIN_LENGTH = 200
+
+
+class ApiError(Exception):
+    pass
+
+
+def dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def requested_fields(request):
+    """Поля из ?fields=id,text; без параметра - все поля."""
+    value = request.GET.get('fields')
+    if not value:
+        return tuple(API_FIELDS)
+    fields = tuple(dict.fromkeys(
+        name.strip() for name in value.split(',') if name.strip()
+    ))
+    unknown = [name for name in fields if name not in API_FIELDS]
+    if unknown or not fields:
+        raise ApiError('Неизвестные поля: {}. Доступны: {}.'.format(
+            ', '.join(unknown), ', '.join(API_FIELDS)
+        ))
+    return fields
+
+
+def requested_limit(request):
+    value = request.GET.get('limit')
+    if value is None:
+        return settings.POSTS_PER_PAGE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ApiError('limit должен быть целым числом.')
+    if not 1 <= limit <= settings.POSTS_API_MAX_LIMIT:
+        raise ApiError(
+            f'limit должен быть от 1 до {settings.POSTS_API_MAX_LIMIT}.'
+        )
+    return limit
+
+
+def api_posts(queryset, fields):
+    """
+    Посты только с колонками выбранных полей. id и pub_date нужны для
+    курсора, а author_id и group_id - менеджерам group.posts и
+    author.posts, которые проставляют связь каждому посту.
+    """
+    columns = ['id', 'pub_date', 'author', 'group']
+    for name in fields:
+        columns.extend(API_FIELDS[name][0])
+    relations = [
+        column.split('__')[0] for column in columns if '__' in column
+    ]
+    # select_related() без аргументов подтянул бы все связи
+    if relations:
+        queryset = queryset.select_related(*relations)
+    return queryset.only(*columns)
+
+
+def serialize(post, fields):
+    return {name: API_FIELDS[name][1](post) for name in fields}
+
+
+def iter_feed_json(page, fields):
+    """Ответ ленты по частям: массив постов и курсоры соседних страниц."""
+    yield b'{"results":['
+    for number, post in enumerate(page.object_list):
+        prefix = ',' if number else ''
+        yield (prefix + dumps(serialize(post, fields))).encode()
+    yield '],"next":{},"previous":{}}}'.format(
+        dumps(page.next_cursor), dumps(page.previous_cursor)
+    ).encode()
+
+
+def api_response(request, chunks, stream=False,
+                 content_type=API_CONTENT_TYPE):
+    """
+    Собирает ответ из частей JSON. Длинная лента отдается потоком и
+    сжимается на лету, короткий ответ - целиком.
+    """
+    encoding = negotiate(request)
+    if stream:
+        if encoding:
+            chunks = compress_chunks(chunks, encoding)
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+    else:
+        content = b''.join(chunks)
+        if encoding and len(content) >= COMPRESS_MIN_LENGTH:
+            content = compress(content, encoding)
+        else:
+            encoding = None
+        response = HttpResponse(content, content_type=content_type)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def error_response(message, status):
+    return HttpResponse(dumps({'error': message}), status=status,
+                        content_type=API_CONTENT_TYPE)
+
+
+def api_view(view):
+    """Ошибки запроса отдает в JSON, а не HTML-страницей."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as error:
+            return error_response(str(error), 400)
+        except Http404:
+            return error_response('Не найдено.', 404)
+    return wrapper
+
+
+def requested_ids(request):
+    """id постов из ?ids=1,2,3 без повторов, в порядке запроса."""
+    values = ','.join(request.GET.getlist('ids')).split(',')
+    try:
+        ids = [int(value) for value in values if value.strip()]
+    except ValueError:
+        raise ApiError('ids должны быть целыми числами через запятую.')
+    if any(not 1 <= pk <= MAX_ID for pk in ids):
+        raise ApiError(f'id должны быть от 1 до {MAX_ID}.')
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise ApiError('Укажите id постов в параметре ids.')
+    if len(ids) > settings.POSTS_API_BATCH_LIMIT:
+        raise ApiError(
+            f'Не больше {settings.POSTS_API_BATCH_LIMIT} id за запрос.'
+        )
+    return ids
+
+
+def requested_cursors(request):
+    """Курсоры ?after= и ?before=; битый курсор - ошибка, а не 1-я страница."""
+    cursors = {}
+    for name in ('after', 'before'):
+        value = request.GET.get(name)
+        if value and decode_cursor(value) is None:
+            raise ApiError(f'Неверный курсор {name}.')
+        cursors[name] = value
+    return cursors
+
+
+def api_feed_etag(request, *args, **kwargs):
+    # сжатые и несжатые байты различаются, у них разные ETag
+    return make_etag(feed_etag(request), negotiate(request))
+
+
+def api_post_etag(request, post_id):
+    etag = post_etag(request, post_id)
+    return etag and make_etag(etag, request.get_full_path(),
+                              negotiate(request))
+
+
+def feed_response(request, queryset):
+    fields = requested_fields(request)
+    limit = requested_limit(request)
+    cursors = requested_cursors(request)
+    paginator = CursorPaginator(api_posts(queryset, fields), limit)
+    page = paginator.get_cursor_page(**cursors)
+    return api_response(
+        request, iter_feed_json(page, fields),
+        stream=len(page.object_list) > settings.POSTS_API_STREAM_AFTER,
+    )
+
+
+@require_safe
+@read_from_replica
+@condition(etag_func=api_feed_etag, last_modified_func=feed_last_modified)
+@api_view
+def index(request):
+    return feed_response(request, Post.objects.all())
+
+
+@require_safe
+@read_from_replica
+@condition(etag_func=api_feed_etag, last_modified_func=feed_last_modified)
+@api_view
+def group_list(request, slug):
+    group = group_by_slug(slug)
+    if group is None:
+        raise Http404
+    return feed_response(request, group.posts.all())
+
+
+@require_safe
+@read_from_replica
+@condition(etag_func=api_feed_etag, last_modified_func=feed_last_modified)
+@api_view
+def profile(request, username):
+    author = author_by_username(username)
+    if author is None:
+        raise Http404
+    return feed_response(request, author.posts.all())
+
+
+@require_safe
+@read_from_replica
+@condition(etag_func=api_post_etag, last_modified_func=feed_last_modified)
+@api_view
+def post_detail(request, post_id):
+    if not 1 <= post_id <= MAX_ID:
+        raise Http404
+    fields = requested_fields(request)
+    post = api_posts(Post.objects.filter(pk=post_id), fields).first()
+    if post is None:
+        raise Http404
+    return api_response(request, [dumps(serialize(post, fields)).encode()])
+
+
+@require_safe
+@read_from_replica
+@condition(etag_func=api_feed_etag, last_modified_func=feed_last_modified)
+@api_view
+def post_batch(request):
+    """
+    Посты по списку id одним запросом, в порядке id из запроса; id, для
+    которых постов нет, перечислены в missing. С ?format=html вместо
+    JSON отдаются подряд карточки includes/post_item.html.
+    """
+    ids = requested_ids(request)
+    response_format = request.GET.get('format', 'json')
+    if response_format == 'html':
+        return batch_html(request, ids)
+    if response_format != 'json':
+        raise ApiError('format может быть json или html.')
+    fields = requested_fields(request)
+    posts = api_posts(Post.objects.all(), fields).in_bulk(ids)
+    return api_response(request, [dumps({
+        'results': [serialize(posts[pk], fields) for pk in ids
+                    if pk in posts],
+        'missing': [pk for pk in ids if pk not in posts],
+    }).encode()])
+
+
+def batch_html(request, ids):
+    posts = Post.objects.for_feed().in_bulk(ids)
+    found = [posts[pk] for pk in ids if pk in posts]
+    cards = render_post_cards(found)
+    response = api_response(
+        request, [''.join(cards[post.pk] for post in found).encode()],
+        content_type='text/html; charset=utf-8',
+    )
+    response['X-Missing-Posts'] = ','.join(
+        str(pk) for pk in ids if pk not in posts
+    )
+    return response
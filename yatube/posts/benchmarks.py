@@ -0,0 +1,170 @@
+import io
+import re
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from posts.cache import bump_feed_generation
+from posts.counters import rebuild_post_counters
+from posts.models import Group, Post
+from posts.timelines import invalidate_timelines
+from posts.utils import bulk_create_with_pub_date
+
+User = get_user_model()
+
+
+@contextmanager
+def benchmark_database(verbosity=0, test_name=None):
+    """
+    Временная база для замеров: рабочие данные не затрагиваются.
+    test_name - файл для базы SQLite вместо базы в памяти: в общей
+    базе в памяти параллельная запись падает на блокировке таблиц.
+    """
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict['TEST']
+    old_test_name = test_settings.get('NAME')
+    if test_name is not None:
+        test_settings['NAME'] = test_name
+    connection.creation.create_test_db(
+        verbosity=verbosity, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        test_settings['NAME'] = old_test_name
+
+
+def seed_posts(count, author=None, group=None, batch_size=5000):
+    if author is None:
+        author, _ = User.objects.get_or_create(username='bench_author')
+    start = timezone.now() - timedelta(seconds=count)
+    for offset in range(0, count, batch_size):
+        bulk_create_with_pub_date(
+            Post(
+                text=f'Пост для замеров номер {number}',
+                pub_date=start + timedelta(seconds=number),
+                author=author,
+                group=group,
+            )
+            for number in range(offset, min(offset + batch_size, count))
+        )
+    return author
+
+
+def measure(func, repeat=5):
+    """Медиана времени выполнения func в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def seed_dataset(users, groups, posts, batch_size=5000):
+    """
+    Авторы, группы и посты для нагрузочных замеров. Посты раздаются
+    авторам и группам по кругу; каждый пятый пост - без группы.
+    """
+    User.objects.bulk_create(
+        User(username=f'bench_user_{number}') for number in range(users)
+    )
+    Group.objects.bulk_create(
+        Group(title=f'Группа {number}', slug=f'bench-group-{number}',
+              description='Группа для замеров')
+        for number in range(groups)
+    )
+    author_ids = list(User.objects.filter(
+        username__startswith='bench_user_'
+    ).values_list('pk', flat=True))
+    group_ids = list(Group.objects.filter(
+        slug__startswith='bench-group-'
+    ).values_list('pk', flat=True))
+    start = timezone.now() - timedelta(seconds=posts)
+    for offset in range(0, posts, batch_size):
+        bulk_create_with_pub_date(
+            Post(
+                text=f'Пост для замеров номер {number}',
+                pub_date=start + timedelta(seconds=number),
+                author_id=author_ids[number % len(author_ids)],
+                group_id=(
+                    group_ids[number % len(group_ids)]
+                    if group_ids and number % 5 else None
+                ),
+            )
+            for number in range(offset, min(offset + batch_size, posts))
+        )
+    # bulk_create обходит сигналы
+    rebuild_post_counters()
+    bump_feed_generation()
+    invalidate_timelines()
+    return author_ids, group_ids
+
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) SQL"')
+
+
+def wsgi_request(application, method, path, body=b'', headers=None):
+    """Запрос к WSGI-приложению в этом же процессе: статус, заголовки, тело."""
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+        **(headers or {}),
+    }
+    setup_testing_defaults(environ)
+    response = {}
+
+    def start_response(status, response_headers, exc_info=None):
+        response['status'] = int(status.split()[0])
+        response['headers'] = dict(response_headers)
+
+    result = application(environ, start_response)
+    try:
+        content = b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return response['status'], response['headers'], content
+
+
+def call_wsgi(application, method, path, body=b'', headers=None):
+    """
+    Запрос к WSGI-приложению в этом же процессе. Возвращает статус,
+    время ответа в миллисекундах и число SQL-запросов из Server-Timing.
+    """
+    started = time.perf_counter()
+    status, response_headers, _ = wsgi_request(
+        application, method, path, body, headers
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    match = SERVER_TIMING_QUERIES.search(
+        response_headers.get('Server-Timing', '')
+    )
+    return status, elapsed, int(match.group(1)) if match else 0
+
+
+def auth_headers(user):
+    """WSGI-заголовки сессии пользователя и CSRF для POST-запросов."""
+    client = Client()
+    client.force_login(user)
+    session = client.cookies[settings.SESSION_COOKIE_NAME].value
+    csrf_token = get_random_string(64)
+    return {
+        'HTTP_COOKIE': (
+            f'{settings.SESSION_COOKIE_NAME}={session}; '
+            f'{settings.CSRF_COOKIE_NAME}={csrf_token}'
+        ),
+        'HTTP_X_CSRFTOKEN': csrf_token,
+        'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+    }
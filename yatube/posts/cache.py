@@ -0,0 +1,142 @@
+import hashlib
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.translation import get_language
+
+
+def posts_cache():
+    return caches[settings.POSTS_CACHE]
+
+
+def version_key(kind, pk):
+    return f'posts:version:{kind}:{pk}'
+
+
+def new_stamp():
+    """Уникальная метка версии; в начале - время выдачи в миллисекундах."""
+    return f'{int(time.time() * 1000):x}.{uuid.uuid4().hex[:8]}'
+
+
+def stamp_datetime(stamp):
+    milliseconds = int(stamp.split('.')[0], 16)
+    return datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc)
+
+
+def bump_versions(kind, *pks):
+    """Выдает объектам новые метки версий: старые записи кэша устаревают."""
+    posts_cache().set_many(
+        {version_key(kind, pk): new_stamp() for pk in pks if pk is not None},
+        timeout=None,
+    )
+
+
+def get_versions(objects):
+    """
+    Метки версий для пар (kind, pk). Вытесненная метка заменяется новой,
+    поэтому после вытеснения старое содержимое не вернется.
+    """
+    keys = {
+        version_key(kind, pk): (kind, pk)
+        for kind, pk in objects if pk is not None
+    }
+    cache = posts_cache()
+    stamps = cache.get_many(keys)
+    missing = {key: new_stamp() for key in keys if key not in stamps}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        stamps.update(missing)
+    return {keys[key]: stamp for key, stamp in stamps.items()}
+
+
+def feed_generation():
+    return get_versions([('feed', 'all')])[('feed', 'all')]
+
+
+def bump_feed_generation():
+    bump_versions('feed', 'all')
+
+
+def lookup_generation():
+    return get_versions([('lookup', 'all')])[('lookup', 'all')]
+
+
+def bump_lookup_generation():
+    bump_versions('lookup', 'all')
+
+
+def page_cache_key(request):
+    params = '&'.join(
+        f'{name}={request.GET.get(name, "")}'
+        for name in ('page', 'after', 'before')
+    )
+    digest = hashlib.md5(
+        f'{request.path}?{params}'.encode()
+    ).hexdigest()
+    return f'posts:page:{feed_generation()}:{get_language()}:{digest}'
+
+
+def record_page_cache(outcome):
+    cache = posts_cache()
+    key = f'posts:page_cache:{outcome}'
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def page_cache_stats():
+    cache = posts_cache()
+    stats = {
+        outcome: cache.get(f'posts:page_cache:{outcome}', 0)
+        for outcome in ('hits', 'misses')
+    }
+    total = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = stats['hits'] / total if total else 0.0
+    return stats
+
+
+def anonymous_page_cache(view):
+    """
+    Кэширует страницу целиком для анонимных GET-запросов. Ключ содержит
+    поколение лент, которое меняется при любой записи поста, группы
+    или пользователя.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (
+            not settings.POSTS_PAGE_CACHE_ENABLED
+            or request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated
+        ):
+            return view(request, *args, **kwargs)
+        cache = posts_cache()
+        key = page_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            record_page_cache('hits')
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Page-Cache'] = 'HIT'
+            return response
+        record_page_cache('misses')
+        response = view(request, *args, **kwargs)
+        if (
+            response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+        ):
+            cache.set(
+                key,
+                (response.content, response['Content-Type']),
+                timeout=settings.POSTS_PAGE_CACHE_TIMEOUT,
+            )
+        response['X-Page-Cache'] = 'MISS'
+        return response
+    return wrapper
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+from posts.cache import get_versions, posts_cache
+
+
+def post_card_key(post, versions):
+    return 'posts:card:{}:{}:{}:{}:{}'.format(
+        post.pk,
+        versions[('post', post.pk)],
+        versions.get(('group', post.group_id), '-'),
+        versions[('user', post.author_id)],
+        get_language(),
+    )
+
+
+def render_post_cards(posts):
+    """Карточки постов из кэша, недостающие отрисовываются и кэшируются."""
+    posts = list(posts)
+    versions = get_versions(
+        pair for post in posts for pair in (
+            ('post', post.pk),
+            ('group', post.group_id),
+            ('user', post.author_id),
+        )
+    )
+    keys = {post_card_key(post, versions): post for post in posts}
+    cache = posts_cache()
+    cards = cache.get_many(keys)
+    missing = {
+        key: render_to_string('includes/post_item.html', {'post': post})
+        for key, post in keys.items() if key not in cards
+    }
+    if missing:
+        cache.set_many(missing, timeout=settings.POSTS_CARD_TIMEOUT)
+        cards.update(missing)
+    return {post.pk: mark_safe(cards[key]) for key, post in keys.items()}
+
+
+def prefetch_post_cards(page_obj):
+    """Готовит карточки всей страницы за одно обращение к кэшу."""
+    page_obj.object_list = list(page_obj.object_list)
+    cards = render_post_cards(page_obj.object_list)
+    for post in page_obj.object_list:
+        post.rendered_card = cards[post.pk]
+    return page_obj
@@ -0,0 +1,47 @@
+import hashlib
+
+from django.utils.translation import get_language
+from posts.cache import feed_generation, get_versions, stamp_datetime
+from posts.models import MAX_ID, Post
+
+
+def make_etag(*parts):
+    return hashlib.md5(
+        '|'.join(str(part) for part in parts).encode()
+    ).hexdigest()
+
+
+def feed_etag(request, *args, **kwargs):
+    return make_etag(
+        feed_generation(),
+        request.get_full_path(),
+        request.user.pk,
+        get_language(),
+    )
+
+
+def feed_last_modified(request, *args, **kwargs):
+    # поколение лент меняется при любой записи, поэтому его время
+    # не меньше времени последнего изменения любой ленты
+    return stamp_datetime(feed_generation())
+
+
+def post_etag(request, post_id):
+    if not 1 <= post_id <= MAX_ID:
+        # такого поста нет; 404 отдаст само представление
+        return None
+    relations = Post.objects.filter(pk=post_id).values_list(
+        'author_id', 'group_id', 'author__post_counter__posts_count'
+    ).first()
+    if relations is None:
+        return None
+    author_id, group_id, posts_count = relations
+    versions = get_versions([
+        ('post', post_id), ('group', group_id), ('user', author_id)
+    ])
+    return make_etag(
+        *sorted(versions.values()),
+        posts_count,
+        request.user.pk,
+        get_language(),
+    )
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from posts.cache import feed_generation, posts_cache
+from posts.models import AuthorCounter, Group, Post
+
+
+def change_author_count(author_id, delta):
+    if author_id is None:
+        return
+    if delta > 0:
+        AuthorCounter.objects.get_or_create(author_id=author_id)
+        AuthorCounter.objects.filter(author_id=author_id).update(
+            posts_count=F('posts_count') + delta
+        )
+    else:
+        AuthorCounter.objects.filter(
+            author_id=author_id, posts_count__gte=-delta
+        ).update(posts_count=F('posts_count') + delta)
+
+
+def change_group_count(group_id, delta):
+    if group_id is None:
+        return
+    groups = Group.objects.filter(pk=group_id)
+    if delta < 0:
+        groups = groups.filter(posts_count__gte=-delta)
+    groups.update(posts_count=F('posts_count') + delta)
+
+
+def author_posts_count(author):
+    try:
+        return author.post_counter.posts_count
+    except AuthorCounter.DoesNotExist:
+        return 0
+
+
+def cached_posts_count(kind, pk, fetch):
+    """
+    Счетчик из кэша posts или из fetch(). В ключе - поколение лент: его
+    меняют запись любого поста и пересчет счетчиков, поэтому прежнее
+    значение после них не читается.
+    """
+    key = f'posts:count:{kind}:{pk}:{feed_generation()}'
+    cache = posts_cache()
+    count = cache.get(key)
+    if count is None:
+        count = fetch()
+        cache.set(key, count, settings.POSTS_LOOKUP_CACHE_TIMEOUT)
+    return count
+
+
+def current_author_posts_count(author_id):
+    """Актуальный счетчик, а не из объекта, который мог взяться из кэша."""
+    return cached_posts_count(
+        'user', author_id,
+        lambda: AuthorCounter.objects.filter(
+            author_id=author_id
+        ).values_list('posts_count', flat=True).first() or 0,
+    )
+
+
+def current_group_posts_count(group_id):
+    return cached_posts_count(
+        'group', group_id,
+        lambda: Group.objects.filter(pk=group_id).values_list(
+            'posts_count', flat=True
+        ).first() or 0,
+    )
+
+
+@transaction.atomic
+def rebuild_post_counters():
+    """Пересчитывает все счетчики по таблице постов."""
+    group_counts = Post.objects.filter(group=OuterRef('pk')).order_by()
+    group_counts = group_counts.values('group').annotate(
+        total=Count('pk')
+    ).values('total')
+    Group.objects.update(posts_count=Coalesce(Subquery(group_counts), 0))
+
+    AuthorCounter.objects.all().delete()
+    author_counts = Post.objects.order_by().values('author').annotate(
+        total=Count('pk')
+    )
+    AuthorCounter.objects.bulk_create(
+        AuthorCounter(author_id=row['author'], posts_count=row['total'])
+        for row in author_counts
+    )
@@ -0,0 +1,60 @@
+import csv
+import json
+
+from posts.models import Post
+
+EXPORT_FIELDS = ('id', 'text', 'author', 'group', 'pub_date')
+EXPORT_FORMATS = {
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def iter_post_rows(batch_size=1000):
+    """
+    Строки постов пачками по ключу id: в памяти не больше одной пачки,
+    а курсор базы не держится открытым между пачками.
+    """
+    last_id = 0
+    while True:
+        rows = list(
+            Post.objects.order_by('id').filter(id__gt=last_id).values_list(
+                'id', 'text', 'author__username', 'group__slug', 'pub_date'
+            )[:batch_size]
+        )
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def export_jsonl(batch_size=1000):
+    for rows in iter_post_rows(batch_size):
+        yield ''.join(
+            json.dumps(
+                dict(zip(EXPORT_FIELDS, row[:4]),
+                     pub_date=row[4].isoformat()),
+                ensure_ascii=False,
+            ) + '\n'
+            for row in rows
+        )
+
+
+def export_csv(batch_size=1000):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for rows in iter_post_rows(batch_size):
+        yield ''.join(
+            writer.writerow(row[:4] + (row[4].isoformat(),)) for row in rows
+        )
+
+
+EXPORTERS = {
+    'jsonl': export_jsonl,
+    'csv': export_csv,
+}
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from posts.cache import lookup_generation
+from posts.models import Group
+
+User = get_user_model()
+
+MISSING = object()
+
+
+class LookupCache:
+    """
+    Кэш процесса с вытеснением давно не запрошенных записей и сроком
+    жизни. Запись действительна, пока не сменилась метка, с которой
+    она сохранена.
+    """
+
+    def __init__(self, size, timeout):
+        self.size = size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, stamp):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return MISSING
+            expires, entry_stamp, value = entry
+            if entry_stamp != stamp or expires < time.monotonic():
+                del self.entries[key]
+                return MISSING
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, stamp, value):
+        with self.lock:
+            self.entries[key] = (
+                time.monotonic() + self.timeout, stamp, value
+            )
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def lookup_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LookupCache(
+                settings.POSTS_LOOKUP_CACHE_SIZE,
+                settings.POSTS_LOOKUP_CACHE_TIMEOUT,
+            )
+    return _cache
+
+
+def cached_lookup(kind, value, fetch):
+    """
+    Объект из кэша процесса или из fetch(). Метка - поколение поиска из
+    кэша posts: его меняют только сохранение и удаление групп и
+    пользователей, а не каждый новый пост. Отсутствие объекта тоже
+    кэшируется. Объект общий для потоков, менять его нельзя; счетчики
+    постов в нем устаревают и читаются отдельно, из кэша posts по
+    поколению лент.
+    """
+    stamp = lookup_generation()
+    cache = lookup_cache()
+    result = cache.get((kind, value), stamp)
+    if result is MISSING:
+        result = fetch()
+        cache.set((kind, value), stamp, result)
+    return result
+
+
+def group_by_slug(slug):
+    return cached_lookup(
+        'group', slug, lambda: Group.objects.filter(slug=slug).first()
+    )
+
+
+def author_by_username(username):
+    return cached_lookup(
+        'user', username,
+        lambda: User.objects.filter(username=username).first(),
+    )
@@ -0,0 +1,126 @@
+import statistics
+import time
+
+from core.compression import compress
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.urls import reverse
+from posts.benchmarks import (benchmark_database, call_wsgi, seed_dataset,
+                              wsgi_request)
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает HTML-страницы лент и JSON API: байты ответа без '
+            'сжатия и с gzip, процессорное время и время ответа на '
+            'страницу.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=20000)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов на каждую страницу.')
+        parser.add_argument('--fields',
+                            help='Поля API через запятую, по умолчанию все.')
+        parser.add_argument('--batch', type=int, default=50,
+                            help='Сколько постов получить по одному и '
+                                 'одним пакетным запросом.')
+
+    def handle(self, *args, **options):
+        from yatube.wsgi import application
+
+        with benchmark_database(), override_settings(
+            DEBUG=False, ALLOWED_HOSTS=['127.0.0.1'],
+        ):
+            seed_dataset(users=100, groups=10, posts=options['posts'])
+            query = f'fields={options["fields"]}' if options['fields'] else ''
+            for view, (html, api) in self.build_paths().items():
+                for kind, path, query_string in (
+                    ('html', html, ''), ('api', api, query),
+                ):
+                    self.report(view, kind, self.run(
+                        application, path, query_string, options['requests']
+                    ))
+            self.compare_batch(application, options['batch'])
+
+    def build_paths(self):
+        user = User.objects.order_by('-post_counter__posts_count').first()
+        group = Group.objects.order_by('-posts_count').first()
+        post_id = Post.objects.values_list('pk', flat=True).first()
+        return {
+            'index': (reverse('posts:index'), reverse('posts:api_index')),
+            'group_list': (
+                reverse('posts:group_list', kwargs={'slug': group.slug}),
+                reverse('posts:api_group_list', kwargs={'slug': group.slug}),
+            ),
+            'profile': (
+                reverse('posts:profile', kwargs={'username': user.username}),
+                reverse('posts:api_profile',
+                        kwargs={'username': user.username}),
+            ),
+            'post_detail': (
+                reverse('posts:post_detail', kwargs={'post_id': post_id}),
+                reverse('posts:api_post_detail', kwargs={'post_id': post_id}),
+            ),
+        }
+
+    def run(self, application, path, query_string, count):
+        headers = {'QUERY_STRING': query_string}
+        # первый запрос прогревает кэши карточек и числа постов
+        status, _, content = wsgi_request(application, 'GET', path,
+                                          headers=headers)
+        if status != 200:
+            raise CommandError(f'{path}: ответ {status}.')
+        latencies = []
+        cpu_started = time.process_time()
+        for _ in range(count):
+            started = time.perf_counter()
+            wsgi_request(application, 'GET', path, headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+        cpu = (time.process_time() - cpu_started) * 1000 / count
+        return {
+            'bytes': len(content),
+            'gzip': len(compress(content, 'gzip')),
+            'cpu': cpu,
+            'p50': statistics.median(latencies),
+        }
+
+    def report(self, view, kind, result):
+        self.stdout.write(
+            f'{view:<12} {kind:<4} {result["bytes"]:7} байт, '
+            f'gzip {result["gzip"]:6} байт, '
+            f'CPU {result["cpu"]:6.2f} мс, p50 {result["p50"]:6.2f} мс'
+        )
+
+    def compare_batch(self, application, count):
+        post_ids = list(Post.objects.values_list('pk', flat=True)[:count])
+        ids = ','.join(str(pk) for pk in post_ids)
+        requests = {
+            'по одному': [
+                (reverse('posts:post_detail', kwargs={'post_id': pk}), '')
+                for pk in post_ids
+            ],
+            'batch json': [(reverse('posts:api_post_batch'), f'ids={ids}')],
+            'batch html': [
+                (reverse('posts:api_post_batch'), f'ids={ids}&format=html'),
+            ],
+        }
+        for name, paths in requests.items():
+            for path, query in paths:
+                wsgi_request(application, 'GET', path,
+                             headers={'QUERY_STRING': query})
+            started = time.perf_counter()
+            queries = 0
+            for path, query in paths:
+                _, _, count_queries = call_wsgi(
+                    application, 'GET', path,
+                    headers={'QUERY_STRING': query},
+                )
+                queries += count_queries
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stdout.write(
+                f'{len(post_ids)} постов {name:<10} {len(paths):3} '
+                f'запр., SQL {queries:3}, {elapsed:7.2f} мс'
+            )
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from posts.benchmarks import benchmark_database, measure, seed_posts
+from posts.models import Post
+from posts.paginators import CursorPaginator, encode_cursor
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время выборки первой и глубокой страницы ленты '
+            'при пагинации по номеру страницы и по курсору.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page', type=int, default=10000,
+                            help='Номер глубокой страницы.')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        deep_page = options['page']
+        per_page = settings.POSTS_PER_PAGE
+        with benchmark_database():
+            seed_posts(deep_page * per_page)
+            posts = Post.objects.all()
+            cursors = {1: None}
+            anchor = CursorPaginator(posts, per_page).object_list[
+                (deep_page - 1) * per_page - 1
+            ]
+            cursors[deep_page] = encode_cursor(anchor)
+
+            for number in (1, deep_page):
+                offset_ms = measure(
+                    lambda: list(Paginator(posts, per_page).page(number)),
+                    options['repeat'],
+                )
+                cursor_ms = measure(
+                    lambda: list(CursorPaginator(posts, per_page)
+                                 .get_cursor_page(after=cursors[number])),
+                    options['repeat'],
+                )
+                self.stdout.write(
+                    f'страница {number:>6}: '
+                    f'offset {offset_ms:8.2f} мс, '
+                    f'cursor {cursor_ms:8.2f} мс'
+                )
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template import Template
+from django.template.context import Context
+from django.template.loader import render_to_string
+from posts.benchmarks import benchmark_database, measure, seed_posts
+from posts.models import Post
+from posts.paginators import FeedPaginator
+
+# прежний вариант шаблона: ссылка на каждую страницу и COUNT(*) на запрос
+FULL_RANGE_TEMPLATE = Template(
+    '{% for i in page_obj.paginator.page_range %}'
+    '<li class="page-item"><a href="?page={{ i }}">{{ i }}</a></li>'
+    '{% endfor %}'
+)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время отрисовки пагинации ленты при росте числа '
+            'постов: полный список страниц против окна страниц.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+',
+                            default=[1000, 10000, 100000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        per_page = settings.POSTS_PER_PAGE
+        with benchmark_database():
+            author = None
+            seeded = 0
+            for size in sorted(options['sizes']):
+                author = seed_posts(size - seeded, author=author)
+                seeded = size
+                posts = Post.objects.all()
+
+                def render_full():
+                    page_obj = Paginator(posts, per_page).get_page(
+                        size // per_page // 2
+                    )
+                    FULL_RANGE_TEMPLATE.render(Context({'page_obj': page_obj}))
+
+                def render_window():
+                    page_obj = FeedPaginator(posts, per_page).get_page(
+                        size // per_page // 2
+                    )
+                    render_to_string(
+                        'includes/paginator.html', {'page_obj': page_obj}
+                    )
+
+                full_ms = measure(render_full, options['repeat'])
+                window_ms = measure(render_window, options['repeat'])
+                self.stdout.write(
+                    f'постов {size:>8}: '
+                    f'все страницы {full_ms:8.2f} мс, '
+                    f'окно страниц {window_ms:8.2f} мс'
+                )
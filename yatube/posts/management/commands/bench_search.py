@@ -0,0 +1,71 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from posts.benchmarks import benchmark_database, measure
+from posts.models import Post
+from posts.search import fts5_ready, get_backend_by_name
+
+User = get_user_model()
+
+VOCABULARY_SIZE = 5000
+
+
+def seed_texts(count, author, words_per_post=30, batch_size=5000):
+    generator = random.Random(0)
+    vocabulary = [f'слово{number}' for number in range(VOCABULARY_SIZE)]
+    for offset in range(0, count, batch_size):
+        Post.objects.bulk_create(
+            Post(
+                text=' '.join(generator.choices(vocabulary, k=words_per_post)),
+                author=author,
+            )
+            for _ in range(offset, min(offset + batch_size, count))
+        )
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает поиск постов через FTS5, индекс в памяти и '
+            'прежний icontains при росте числа постов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+',
+                            default=[1000, 10000, 100000])
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--query', default='слово4242 слово777')
+
+    def handle(self, *args, **options):
+        query = options['query']
+        words = query.split()
+        with benchmark_database():
+            author = User.objects.create(username='bench_author')
+            seeded = 0
+            for size in sorted(options['sizes']):
+                seed_texts(size - seeded, author)
+                seeded = size
+
+                def search_icontains():
+                    queryset = Post.objects.all()
+                    for word in words:
+                        queryset = queryset.filter(text__icontains=word)
+                    queryset.count()
+                    list(queryset.values_list('id', flat=True)[:10])
+
+                results = [
+                    ('icontains', measure(search_icontains, options['repeat']))
+                ]
+                names = ['fts5', 'python'] if fts5_ready() else ['python']
+                for name in names:
+                    backend = get_backend_by_name(name)
+                    backend.rebuild()
+
+                    def search_backend():
+                        backend.count(query)
+                        backend.search_ids(query, 0, 10)
+
+                    results.append(
+                        (name, measure(search_backend, options['repeat']))
+                    )
+                self.stdout.write(f'постов {size:>8}: ' + ', '.join(
+                    f'{name} {ms:8.2f} мс' for name, ms in results
+                ))
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from posts.benchmarks import benchmark_database, measure, seed_posts
+from posts.models import Post
+from posts.paginators import FeedPaginator
+from posts.timelines import TimelineSequence, invalidate_timelines
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает чтение страниц общей ленты запросом к базе и из '
+            'ленты id постов в кэше при росте числа постов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+',
+                            default=[1000, 10000, 100000])
+        parser.add_argument('--pages', type=int, nargs='+', default=[1, 50])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        per_page = settings.POSTS_PER_PAGE
+        with benchmark_database():
+            author = None
+            seeded = 0
+            for size in sorted(options['sizes']):
+                author = seed_posts(size - seeded, author=author)
+                seeded = size
+                # посты созданы bulk_create, мимо сигналов
+                invalidate_timelines()
+                for number in options['pages']:
+                    def read_query():
+                        page_obj = FeedPaginator(
+                            Post.objects.for_feed(), per_page, count=size
+                        ).get_page(number)
+                        return list(page_obj)
+
+                    def read_timeline():
+                        page_obj = FeedPaginator(
+                            TimelineSequence('all', 'all'), per_page,
+                            count=size,
+                        ).get_page(number)
+                        return list(page_obj)
+
+                    read_timeline()
+                    results = []
+                    for name, func in (('запрос', read_query),
+                                       ('лента', read_timeline)):
+                        with CaptureQueriesContext(connection) as queries:
+                            func()
+                        results.append(
+                            f'{name} {measure(func, options["repeat"]):7.2f} '
+                            f'мс ({len(queries)} SQL)'
+                        )
+                    self.stdout.write(
+                        f'постов {size:>8}, страница {number:>4}: '
+                        + ', '.join(results)
+                    )
@@ -0,0 +1,199 @@
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from core.timing import percentiles
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.urls import reverse
+from posts.benchmarks import (auth_headers, benchmark_database, call_wsgi,
+                              seed_dataset)
+from posts.models import Group, Post
+from posts.writer import post_writer
+
+User = get_user_model()
+
+VIEWS = ('index', 'group_list', 'profile', 'post_detail', 'post_create')
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный замер представлений posts через WSGI-приложение '
+            'в этом процессе: запросы в секунду, перцентили времени ответа '
+            'и число SQL-запросов. С --baseline сравнивает результат с '
+            'сохраненным и завершается ошибкой при регрессии.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов на каждое представление.')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--views', nargs='+', choices=VIEWS,
+                            default=VIEWS)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--baseline',
+                            help='JSON с прошлым результатом для сравнения.')
+        parser.add_argument('--save-baseline',
+                            help='Куда сохранить результат как baseline.')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Допустимое ухудшение rps и p95, доля.')
+        parser.add_argument('--write-queue', action='store_true',
+                            help='Сохранять новые посты через очередь записи.')
+
+    def handle(self, *args, **options):
+        # wsgi.py настраивает окружение, поэтому импорт - после setup
+        from yatube.wsgi import application
+
+        dataset = {
+            name: options[name] for name in ('users', 'groups', 'posts')
+        }
+        test_name = os.path.join(
+            tempfile.gettempdir(), f'yatube_bench_{os.getpid()}.sqlite3'
+        )
+        with benchmark_database(test_name=test_name), override_settings(
+            DEBUG=False, ALLOWED_HOSTS=['127.0.0.1'],
+            POSTS_WRITE_QUEUE_ENABLED=options['write_queue'],
+        ):
+            self.stdout.write('Заполняем базу: {}.'.format(
+                ', '.join(f'{name} {value}' for name, value in dataset.items())
+            ))
+            seed_dataset(**dataset)
+            requests = self.build_requests(options['seed'])
+            results = {}
+            for view in options['views']:
+                results[view] = self.run_view(
+                    application, requests[view],
+                    options['requests'], options['concurrency'],
+                )
+                self.report(view, results[view])
+            if options['write_queue']:
+                post_writer().stop()
+
+        report = {
+            'dataset': dataset,
+            'concurrency': options['concurrency'],
+            'write_queue': options['write_queue'],
+            'views': results,
+        }
+        if options['save_baseline']:
+            with open(options['save_baseline'], 'w') as stream:
+                json.dump(report, stream, indent=2)
+        if options['baseline']:
+            self.compare(report, options['baseline'], options['tolerance'])
+
+    def build_requests(self, seed):
+        generator = random.Random(seed)
+        usernames = list(User.objects.values_list('username', flat=True))
+        slugs = list(Group.objects.values_list('slug', flat=True))
+        post_ids = list(Post.objects.values_list('pk', flat=True)[:10000])
+        per_page = settings.POSTS_PER_PAGE
+        pages = max(1, min(100, len(post_ids) // per_page))
+
+        headers = auth_headers(User.objects.get(username=usernames[0]))
+
+        def page():
+            return f'?page={generator.randint(1, pages)}'
+
+        return {
+            'index': lambda: (
+                'GET', reverse('posts:index'), page(), b'', {}
+            ),
+            'group_list': lambda: (
+                'GET',
+                reverse('posts:group_list',
+                        kwargs={'slug': generator.choice(slugs)}),
+                page(), b'', {},
+            ),
+            'profile': lambda: (
+                'GET',
+                reverse('posts:profile',
+                        kwargs={'username': generator.choice(usernames)}),
+                '', b'', {},
+            ),
+            'post_detail': lambda: (
+                'GET',
+                reverse('posts:post_detail',
+                        kwargs={'post_id': generator.choice(post_ids)}),
+                '', b'', {},
+            ),
+            'post_create': lambda: (
+                'POST', reverse('posts:post_create'), '',
+                urlencode({'text': 'Пост из нагрузочного замера'}).encode(),
+                headers,
+            ),
+        }
+
+    def run_view(self, application, make_request, count, concurrency):
+        requests = [make_request() for _ in range(count)]
+
+        def send(request):
+            method, path, query, body, headers = request
+            return call_wsgi(
+                application, method, path, body,
+                {'QUERY_STRING': query.lstrip('?'), **headers},
+            )
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            responses = list(executor.map(send, requests))
+        elapsed = time.perf_counter() - started
+
+        errors = [status for status, _, _ in responses if status >= 400]
+        if errors:
+            raise CommandError(
+                f'{len(errors)} ответов с ошибкой, например {errors[0]}.'
+            )
+        latencies = [latency for _, latency, _ in responses]
+        return {
+            'requests': count,
+            'rps': count / elapsed,
+            **percentiles(latencies),
+            'queries': max(queries for _, _, queries in responses),
+        }
+
+    def report(self, view, result):
+        self.stdout.write(
+            f'{view:<12} {result["rps"]:8.1f} запр/с, '
+            f'p50 {result["p50"]:7.2f} мс, p95 {result["p95"]:7.2f} мс, '
+            f'p99 {result["p99"]:7.2f} мс, SQL {result["queries"]}'
+        )
+
+    def compare(self, report, path, tolerance):
+        with open(path) as stream:
+            baseline = json.load(stream)
+        if baseline['dataset'] != report['dataset']:
+            self.stdout.write(self.style.WARNING(
+                'Набор данных отличается от baseline, сравнение неточно.'
+            ))
+        regressions = []
+        for view, result in report['views'].items():
+            old = baseline['views'].get(view)
+            if old is None:
+                continue
+            if result['rps'] < old['rps'] * (1 - tolerance):
+                regressions.append(
+                    f'{view}: {result["rps"]:.1f} запр/с против '
+                    f'{old["rps"]:.1f}'
+                )
+            if result['p95'] > old['p95'] * (1 + tolerance):
+                regressions.append(
+                    f'{view}: p95 {result["p95"]:.2f} мс против '
+                    f'{old["p95"]:.2f}'
+                )
+            if result['queries'] > old['queries']:
+                regressions.append(
+                    f'{view}: {result["queries"]} SQL против '
+                    f'{old["queries"]}'
+                )
+        if regressions:
+            raise CommandError(
+                'Регрессия относительно baseline:\n' + '\n'.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS('Регрессий нет.'))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from posts.exporters import EXPORTERS
+
+
+class Command(BaseCommand):
+    help = ('Выгружает статьи в JSONL или CSV потоком, не загружая '
+            'таблицу в память. Формат совместим с import_posts.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORTERS, default='jsonl')
+        parser.add_argument('--output', help='Файл; по умолчанию - stdout.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunks = EXPORTERS[options['format']](options['batch_size'])
+        if options['output'] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as stream:
+            stream.writelines(chunks)
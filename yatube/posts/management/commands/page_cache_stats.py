@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from posts.cache import page_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает попадания и промахи кэша страниц лент.'
+
+    def handle(self, *args, **options):
+        stats = page_cache_stats()
+        self.stdout.write(
+            f'попаданий: {stats["hits"]}, промахов: {stats["misses"]}, '
+            f'доля попаданий: {stats["hit_ratio"]:.1%}'
+        )
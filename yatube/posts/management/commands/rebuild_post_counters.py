@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from posts.cache import bump_feed_generation
+from posts.counters import rebuild_post_counters
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счетчики статей авторов и групп.'
+
+    def handle(self, *args, **options):
+        rebuild_post_counters()
+        # счетчики изменены без сигналов, кэши их значений устарели
+        bump_feed_generation()
+        self.stdout.write(self.style.SUCCESS('Счетчики статей пересчитаны.'))
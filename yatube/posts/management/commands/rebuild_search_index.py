@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from posts.search import get_backend
+
+
+class Command(BaseCommand):
+    help = ('Перестраивает поисковый индекс постов, например после '
+            'импорта в обход ORM.')
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Поисковый индекс перестроен ({type(backend).__name__}).'
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from posts.models import AuthorCounter, Group
+from posts.timelines import invalidate_timelines, load_timeline
+
+
+class Command(BaseCommand):
+    help = ('Сбрасывает ленты из id постов и заново строит общую ленту, '
+            'ленты групп и авторов.')
+
+    def handle(self, *args, **options):
+        invalidate_timelines()
+        pairs = [('all', 'all')]
+        pairs += [('group', pk) for pk in Group.objects.values_list(
+            'pk', flat=True
+        )]
+        pairs += [('user', pk) for pk in AuthorCounter.objects.filter(
+            posts_count__gt=0
+        ).values_list('author_id', flat=True)]
+        for kind, pk in pairs:
+            load_timeline(kind, pk)
+        self.stdout.write(
+            self.style.SUCCESS(f'Лент перестроено: {len(pairs)}.')
+        )
@@ -0,0 +1,55 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_post_counters(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Group = apps.get_model('posts', 'Group')
+    AuthorCounter = apps.get_model('posts', 'AuthorCounter')
+    group_counts = Post.objects.order_by().values('group').annotate(
+        total=models.Count('pk')
+    )
+    for row in group_counts:
+        if row['group'] is not None:
+            Group.objects.filter(pk=row['group']).update(
+                posts_count=row['total']
+            )
+    author_counts = Post.objects.order_by().values('author').annotate(
+        total=models.Count('pk')
+    )
+    AuthorCounter.objects.bulk_create(
+        AuthorCounter(author_id=row['author'], posts_count=row['total'])
+        for row in author_counts
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0006_auto_20211002_1102'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество статей'),
+        ),
+        migrations.CreateModel(
+            name='AuthorCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('posts_count', models.PositiveIntegerField(default=0, verbose_name='Количество статей')),
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='post_counter', to=settings.AUTH_USER_MODEL, verbose_name='Автор статей')),
+            ],
+            options={
+                'verbose_name': 'Счетчик статей автора',
+                'verbose_name_plural': 'Счетчики статей авторов',
+            },
+        ),
+        migrations.RunPython(fill_post_counters, migrations.RunPython.noop),
+    ]
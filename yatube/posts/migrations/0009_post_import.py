@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_post_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostImport',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255, unique=True, verbose_name='Источник импорта')),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='Обработано записей')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'Импорт статей',
+                'verbose_name_plural': 'Импорты статей',
+            },
+        ),
+    ]
@@ -1,6 +1,16 @@
 from django.contrib.auth.models import User
 from django.db import models
 
+# наибольший id, который помещается в целое SQLite; id больше него
+# из URL нельзя передать в запрос - драйвер падает с OverflowError
+MAX_ID = 2 ** 63 - 1
+
+
+class PostQuerySet(models.QuerySet):
+    def for_feed(self):
+        """Посты вместе с авторами и группами - без запроса на каждый пост."""
+        return self.select_related('author', 'group')
+
 
 class Post(models.Model):
     text = models.TextField(verbose_name='Текст статьи',
@@ -20,10 +30,20 @@ class Post(models.Model):
                               help_text='Выберите тематическую группу '
                                         'в выпадающем списке по желанию')
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Статья'
         verbose_name_plural = 'Статьи'
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
+        indexes = (
+            models.Index(fields=('author', '-pub_date', '-id'),
+                         name='post_author_pub_date_idx'),
+            models.Index(fields=('group', '-pub_date', '-id'),
+                         name='post_group_pub_date_idx'),
+            models.Index(fields=('-pub_date', '-id'),
+                         name='post_pub_date_idx'),
+        )
 
     def __str__(self):
         return self.text[:15]
@@ -36,6 +56,9 @@ class Group(models.Model):
                             help_text='Укажите порядковый номер группы')
     description = models.TextField(verbose_name='Описание группы',
                                    help_text='Добавьте текст описания группы')
+    posts_count = models.PositiveIntegerField(default=0, editable=False,
+                                              verbose_name='Количество '
+                                                           'статей')
 
     class Meta:
         verbose_name = 'Группа статей'
@@ -44,3 +67,35 @@ class Group(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class AuthorCounter(models.Model):
+    author = models.OneToOneField(User, on_delete=models.CASCADE,
+                                  related_name='post_counter',
+                                  verbose_name='Автор статей')
+    posts_count = models.PositiveIntegerField(default=0,
+                                              verbose_name='Количество '
+                                                           'статей')
+
+    class Meta:
+        verbose_name = 'Счетчик статей автора'
+        verbose_name_plural = 'Счетчики статей авторов'
+
+    def __str__(self):
+        return f'{self.author}: {self.posts_count}'
+
+
+class PostImport(models.Model):
+    source = models.CharField(max_length=255, unique=True,
+                              verbose_name='Источник импорта')
+    position = models.PositiveIntegerField(default=0,
+                                           verbose_name='Обработано записей')
+    updated = models.DateTimeField(auto_now=True,
+                                   verbose_name='Дата обновления')
+
+    class Meta:
+        verbose_name = 'Импорт статей'
+        verbose_name_plural = 'Импорты статей'
+
+    def __str__(self):
+        return f'{self.source}: {self.position}'
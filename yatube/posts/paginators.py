@@ -0,0 +1,181 @@
+import base64
+import binascii
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from posts.cache import feed_generation, posts_cache
+
+
+def encode_cursor(post):
+    value = f'{post.pub_date.isoformat()}|{post.pk}'
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Возвращает пару (pub_date, id) или None для битого курсора."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        value = base64.urlsafe_b64decode(padded.encode()).decode()
+        pub_date, pk = value.split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        return None
+    if pub_date is None:
+        return None
+    return pub_date, pk
+
+
+class FeedPage(Page):
+    on_each_side = 2
+    on_ends = 1
+
+    @property
+    def page_window(self):
+        """
+        Номера страниц вокруг текущей и по краям; пропуски - None.
+        Число ссылок не растет вместе с числом страниц.
+        """
+        num_pages = self.paginator.num_pages
+        shown = set(range(1, min(self.on_ends, num_pages) + 1))
+        shown.update(range(max(num_pages - self.on_ends + 1, 1),
+                           num_pages + 1))
+        shown.update(range(max(self.number - self.on_each_side, 1),
+                           min(self.number + self.on_each_side,
+                               num_pages) + 1))
+        previous = 0
+        for number in sorted(shown):
+            if number - previous > 1:
+                yield None
+            yield number
+            previous = number
+
+
+class FeedPaginator(Paginator):
+    """
+    Paginator лент: число постов берется из счетчика, если оно известно,
+    иначе из кэша. Запись сбрасывает кэш через поколение лент, а время
+    жизни ограничивает расхождение, если кэш не общий для процессов.
+    """
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None:
+            return super().count
+        try:
+            sql = str(query)
+        except EmptyResultSet:
+            return 0
+        key = 'posts:count:{}:{}'.format(
+            feed_generation(), hashlib.md5(sql.encode()).hexdigest()
+        )
+        cache = posts_cache()
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(key, count, timeout=settings.POSTS_COUNT_TIMEOUT)
+        return count
+
+    def _get_page(self, *args, **kwargs):
+        return FeedPage(*args, **kwargs)
+
+
+class CursorPage(Page):
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, has_previous, has_next):
+        super().__init__(object_list, None, paginator)
+        self._has_previous = has_previous
+        self._has_next = has_next
+
+    def __repr__(self):
+        return '<CursorPage of %s posts>' % len(self.object_list)
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return encode_cursor(self.object_list[0])
+
+
+class CursorPaginator(Paginator):
+    """
+    Пагинация по ключу (pub_date, id): страница выбирается условием
+    по курсору, без OFFSET и без COUNT(*).
+    """
+    ordering = ('-pub_date', '-id')
+
+    def __init__(self, object_list, per_page):
+        super().__init__(object_list.order_by(*self.ordering), per_page)
+
+    def get_cursor_page(self, after=None, before=None):
+        if before:
+            position = decode_cursor(before)
+            if position is not None:
+                page = self._page_before(*position)
+                if page.object_list:
+                    return page
+        position = decode_cursor(after) if after else None
+        if position is None:
+            return self._page_after()
+        return self._page_after(*position)
+
+    def _page_after(self, pub_date=None, pk=None):
+        queryset = self.object_list
+        if pub_date is not None:
+            queryset = queryset.filter(pub_date__lte=pub_date).filter(
+                Q(pub_date__lt=pub_date) | Q(pk__lt=pk)
+            )
+        rows = list(queryset[:self.per_page + 1])
+        return CursorPage(
+            rows[:self.per_page],
+            self,
+            has_previous=pub_date is not None,
+            has_next=len(rows) > self.per_page,
+        )
+
+    def _page_before(self, pub_date, pk):
+        queryset = self.object_list.filter(pub_date__gte=pub_date).filter(
+            Q(pub_date__gt=pub_date) | Q(pk__gt=pk)
+        ).order_by('pub_date', 'id')
+        rows = list(queryset[:self.per_page + 1])
+        return CursorPage(
+            rows[:self.per_page][::-1],
+            self,
+            has_previous=len(rows) > self.per_page,
+            has_next=True,
+        )
+
+
+def paginate(request, posts, count=None):
+    if settings.POSTS_PAGINATION_MODE == 'cursor':
+        paginator = CursorPaginator(posts, settings.POSTS_PER_PAGE)
+        return paginator.get_cursor_page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
+    paginator = FeedPaginator(posts, settings.POSTS_PER_PAGE, count=count)
+    return paginator.get_page(request.GET.get('page'))
@@ -0,0 +1,217 @@
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection
+from posts.models import Post
+
+FTS_TABLE = 'posts_post_fts'
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class FTS5Backend:
+    """
+    Поиск по таблице SQLite FTS5. Таблицу и триггеры, которые держат ее
+    в согласии с posts_post, создает миграция 0010.
+    """
+
+    def match_expression(self, query):
+        # каждое слово - отдельная фраза с поиском по префиксу, поэтому
+        # спецсимволы запроса не ломают синтаксис FTS5; запрос без слов
+        # дает пустую строку, на которой MATCH падает, - ее не ищем
+        return ' '.join(f'"{token}"*' for token in tokenize(query))
+
+    def search_ids(self, query, offset, limit):
+        if not self.match_expression(query):
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                f'ORDER BY rank, rowid DESC LIMIT %s OFFSET %s',
+                [self.match_expression(query), limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def count(self, query):
+        if not self.match_expression(query):
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s',
+                [self.match_expression(query)],
+            )
+            return cursor.fetchone()[0]
+
+    def filter_queryset(self, queryset, query):
+        if not self.match_expression(query):
+            return queryset.none()
+        return queryset.extra(where=[
+            f'{Post._meta.db_table}.id IN (SELECT rowid FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s)'
+        ], params=[self.match_expression(query)])
+
+    def index_post(self, post):
+        pass
+
+    def remove_post(self, post_id):
+        pass
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
+
+
+class InvertedIndexBackend:
+    """
+    Инвертированный индекс в памяти процесса для баз без FTS5: слова
+    ищутся целиком, а не по префиксу. Только для разработки и тестов:
+    индекс строится при первом поиске и обновляется сигналами постов
+    этого процесса, поэтому посты, записанные другими процессами
+    (воркерами сервера, командами manage.py), он не видит.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.postings = None
+        self.documents = None
+
+    def ensure_built(self):
+        with self.lock:
+            if self.postings is None:
+                self.postings = defaultdict(dict)
+                self.documents = {}
+                rows = Post.objects.values_list('id', 'text').iterator()
+                for post_id, text in rows:
+                    self._add(post_id, text)
+
+    def _add(self, post_id, text):
+        tokens = tokenize(text)
+        frequencies = Counter(tokens)
+        self.documents[post_id] = (len(tokens), frozenset(frequencies))
+        for token, frequency in frequencies.items():
+            self.postings[token][post_id] = frequency
+
+    def _remove(self, post_id):
+        _, tokens = self.documents.pop(post_id, (0, ()))
+        for token in tokens:
+            documents = self.postings[token]
+            documents.pop(post_id, None)
+            if not documents:
+                del self.postings[token]
+
+    def ranked_ids(self, query):
+        self.ensure_built()
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+        with self.lock:
+            matches = sorted(
+                (self.postings.get(token, {}) for token in tokens), key=len
+            )
+            candidates = set(matches[0])
+            for documents in matches[1:]:
+                candidates.intersection_update(documents)
+            total = len(self.documents)
+            weights = [
+                (documents, math.log(1 + total / len(documents)))
+                for documents in matches if documents
+            ]
+            scores = {
+                pk: sum(documents[pk] * idf for documents, idf in weights)
+                / (1 + self.documents[pk][0])
+                for pk in candidates
+            }
+        return sorted(scores, key=lambda pk: (-scores[pk], -pk))
+
+    def search_ids(self, query, offset, limit):
+        return self.ranked_ids(query)[offset:offset + limit]
+
+    def count(self, query):
+        return len(self.ranked_ids(query))
+
+    def filter_queryset(self, queryset, query):
+        # в IN уходят только лучшие id, чтобы не упереться в лимит
+        # переменных запроса SQLite (999 до версии 3.32)
+        ids = self.ranked_ids(query)[:settings.POSTS_SEARCH_MAX_IDS]
+        return queryset.filter(pk__in=ids)
+
+    def index_post(self, post):
+        with self.lock:
+            if self.postings is not None:
+                self._remove(post.pk)
+                self._add(post.pk, post.text)
+
+    def remove_post(self, post_id):
+        with self.lock:
+            if self.postings is not None:
+                self._remove(post_id)
+
+    def rebuild(self):
+        with self.lock:
+            self.postings = None
+        self.ensure_built()
+
+
+def fts5_ready():
+    if connection.vendor != 'sqlite':
+        return False
+    return FTS_TABLE in connection.introspection.table_names()
+
+
+BACKENDS = {
+    'fts5': FTS5Backend,
+    'python': InvertedIndexBackend,
+}
+_backends = {}
+
+
+def get_backend():
+    name = settings.POSTS_SEARCH_BACKEND
+    if name not in _backends:
+        if name == 'auto':
+            _backends[name] = get_backend_by_name(
+                'fts5' if fts5_ready() else 'python'
+            )
+        else:
+            _backends[name] = BACKENDS[name]()
+    return _backends[name]
+
+
+def get_backend_by_name(name):
+    if name not in _backends:
+        _backends[name] = BACKENDS[name]()
+    return _backends[name]
+
+
+class SearchResults:
+    """
+    Ленивая последовательность найденных постов для Paginator: срез
+    запрашивает у движка только id своей страницы.
+    """
+
+    def __init__(self, query, backend=None):
+        self.query = query
+        self.backend = backend or get_backend()
+
+    def count(self):
+        return self.backend.count(self.query)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        start = key.start or 0
+        ids = self.backend.search_ids(self.query, start, key.stop - start)
+        posts = Post.objects.for_feed().in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
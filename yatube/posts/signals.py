@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from posts.cache import (bump_feed_generation, bump_lookup_generation,
+                         bump_versions)
+from posts.counters import change_author_count, change_group_count
+from posts.models import Group, Post
+from posts.search import get_backend
+from posts.timelines import update_timelines
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_relations(sender, instance, **kwargs):
+    previous = None
+    if instance.pk is not None:
+        previous = Post.objects.filter(pk=instance.pk).values_list(
+            'author_id', 'group_id'
+        ).first()
+    instance._previous_relations = previous or (None, None)
+
+
+@receiver(post_save, sender=Post)
+def update_counters_on_save(sender, instance, **kwargs):
+    old_author_id, old_group_id = instance._previous_relations
+    if old_author_id != instance.author_id:
+        change_author_count(old_author_id, -1)
+        change_author_count(instance.author_id, 1)
+    if old_group_id != instance.group_id:
+        change_group_count(old_group_id, -1)
+        change_group_count(instance.group_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def update_counters_on_delete(sender, instance, **kwargs):
+    change_author_count(instance.author_id, -1)
+    change_group_count(instance.group_id, -1)
+
+
+def bump_on_commit(kind, pk, using, lookups=False):
+    """
+    Новые метки версий сразу и еще раз после фиксации транзакции: до нее
+    другие запросы читают прежние данные и могли сохранить их в кэш под
+    первой меткой. Метка только сбрасывает кэш, поэтому при откате
+    лишняя метка стоит одного промаха.
+    """
+    def bump():
+        bump_versions(kind, pk)
+        bump_feed_generation()
+        if lookups:
+            bump_lookup_generation()
+    bump()
+    transaction.on_commit(bump, using=using)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def bump_post_version(sender, instance, using, **kwargs):
+    bump_on_commit('post', instance.pk, using)
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, using, **kwargs):
+    transaction.on_commit(
+        lambda: get_backend().index_post(instance), using=using
+    )
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, using, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: get_backend().remove_post(pk), using=using)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_post(sender, instance, using, **kwargs):
+    update_timelines(instance, *instance._previous_relations, using=using)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_timelines(sender, instance, using, **kwargs):
+    update_timelines(
+        instance, instance.author_id, instance.group_id, deleted=True,
+        using=using,
+    )
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def bump_group_version(sender, instance, using, **kwargs):
+    bump_on_commit('group', instance.pk, using, lookups=True)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_user_version(sender, instance, using, update_fields=None,
+                      **kwargs):
+    # вход пользователя обновляет только last_login, карточки не меняются
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    bump_on_commit('user', instance.pk, using, lookups=True)
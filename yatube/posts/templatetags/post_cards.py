@@ -0,0 +1,12 @@
+from django import template
+from posts.cards import render_post_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    card = getattr(post, 'rendered_card', None)
+    if card is None:
+        card = render_post_cards([post])[post.pk]
+    return card
@@ -0,0 +1,233 @@
+import gzip
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostsApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Тестовый пользователь')
+        cls.group = Group.objects.create(
+            title='Тестовое название',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.posts = [
+            Post.objects.create(
+                text=f'Тестовый пост {number}',
+                author=cls.user,
+                group=cls.group if number % 2 else None,
+            )
+            for number in range(5)
+        ]
+
+    def setUp(self):
+        self.client = Client()
+
+    def get_json(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return response, json.loads(response.content)
+
+    def test_feeds_return_posts_newest_first(self):
+        """Проверка, что ленты API отдают посты от новых к старым."""
+        urls = {
+            reverse('posts:api_index'): 5,
+            reverse('posts:api_group_list',
+                    kwargs={'slug': self.group.slug}): 2,
+            reverse('posts:api_profile',
+                    kwargs={'username': self.user.username}): 5,
+        }
+        for url, count in urls.items():
+            with self.subTest(url=url):
+                response, data = self.get_json(url)
+                self.assertEqual(response.status_code, 200)
+                ids = [post['id'] for post in data['results']]
+                self.assertEqual(len(ids), count)
+                self.assertEqual(ids, sorted(ids, reverse=True))
+
+    def test_cursor_pagination_walks_feed(self):
+        """Проверка, что курсоры обходят ленту без пропусков и повторов."""
+        url = reverse('posts:api_index')
+        _, data = self.get_json(url, limit=2)
+        seen = [post['id'] for post in data['results']]
+        self.assertIsNone(data['previous'])
+        while data['next']:
+            _, data = self.get_json(url, limit=2, after=data['next'])
+            seen.extend(post['id'] for post in data['results'])
+        self.assertEqual(seen, [post.pk for post in reversed(self.posts)])
+        _, back = self.get_json(url, limit=2, before=data['previous'])
+        self.assertEqual([post['id'] for post in back['results']],
+                         seen[2:4])
+
+    def test_sparse_fields(self):
+        """Проверка, что отдаются только запрошенные поля."""
+        post = self.posts[1]
+        _, data = self.get_json(
+            reverse('posts:api_post_detail', kwargs={'post_id': post.pk}),
+            fields='id,group',
+        )
+        self.assertEqual(data, {'id': post.pk, 'group': self.group.slug})
+        _, data = self.get_json(
+            reverse('posts:api_post_detail', kwargs={'post_id': post.pk})
+        )
+        self.assertEqual(data['author'], self.user.username)
+        self.assertEqual(data['text'], post.text)
+
+    def test_sparse_fields_single_posts_query(self):
+        """Проверка, что посты ленты с частью полей - один запрос."""
+        urls = (
+            reverse('posts:api_group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:api_profile',
+                    kwargs={'username': self.user.username}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as context:
+                    self.client.get(url, {'fields': 'id,text'})
+                posts_queries = [
+                    query for query in context.captured_queries
+                    if 'FROM "posts_post"' in query['sql']
+                ]
+                self.assertEqual(len(posts_queries), 1)
+
+    def test_bad_parameters_return_400(self):
+        """Проверка, что неверные параметры дают 400 с текстом ошибки."""
+        for params in ({'fields': 'id,password'}, {'limit': '0'},
+                       {'limit': 'много'}, {'after': 'не курсор'},
+                       {'before': 'bm90LWN1cnNvcg'}):
+            with self.subTest(params=params):
+                response, data = self.get_json(reverse('posts:api_index'),
+                                               **params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', data)
+                self.assertTrue(response.content.startswith(b'{"error":"'))
+
+    def test_missing_objects_return_json_404(self):
+        """Проверка, что отсутствующие объекты дают 404 в JSON."""
+        urls = (
+            reverse('posts:api_post_detail', kwargs={'post_id': 10 ** 6}),
+            reverse('posts:api_post_detail', kwargs={'post_id': 10 ** 20}),
+            reverse('posts:api_group_list', kwargs={'slug': 'missing'}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response, data = self.get_json(url)
+                self.assertEqual(response.status_code, 404)
+                self.assertIn('error', data)
+
+    def test_gzip_compression(self):
+        """Проверка, что при Accept-Encoding: gzip ответ сжат."""
+        response = self.client.get(reverse('posts:api_index'),
+                                   HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(len(data['results']), 5)
+
+    @override_settings(POSTS_API_STREAM_AFTER=2)
+    def test_long_page_is_streamed(self):
+        """Проверка, что длинная страница отдается потоком."""
+        response = self.client.get(reverse('posts:api_index'),
+                                   HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response.streaming)
+        data = json.loads(
+            gzip.decompress(b''.join(response.streaming_content))
+        )
+        self.assertEqual(len(data['results']), 5)
+
+    def test_not_modified(self):
+        """Проверка, что повторный запрос с ETag получает 304."""
+        url = reverse('posts:api_index')
+        response = self.client.get(url)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+
+class PostsBatchApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Тестовый пользователь')
+        cls.group = Group.objects.create(
+            title='Тестовое название',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.posts = [
+            Post.objects.create(
+                text=f'Тестовый пост {number}',
+                author=cls.user,
+                group=cls.group,
+            )
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        self.client = Client()
+        self.url = reverse('posts:api_post_batch')
+        self.missing_id = self.posts[-1].pk + 100
+
+    def test_batch_preserves_order_and_reports_missing(self):
+        """Проверка порядка постов и списка отсутствующих id."""
+        ids = [self.posts[2].pk, self.missing_id, self.posts[0].pk]
+        response = self.client.get(self.url, {
+            'ids': ','.join(map(str, ids)), 'fields': 'id,author,group',
+        })
+        data = json.loads(response.content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([post['id'] for post in data['results']],
+                         [self.posts[2].pk, self.posts[0].pk])
+        self.assertEqual(data['results'][0]['author'], self.user.username)
+        self.assertEqual(data['results'][0]['group'], self.group.slug)
+        self.assertEqual(data['missing'], [self.missing_id])
+
+    def test_batch_uses_single_posts_query(self):
+        """Проверка, что посты с авторами и группами - один запрос."""
+        ids = ','.join(str(post.pk) for post in self.posts)
+        for response_format in ('json', 'html'):
+            with self.subTest(format=response_format):
+                with CaptureQueriesContext(connection) as context:
+                    self.client.get(self.url, {'ids': ids,
+                                               'format': response_format})
+                posts_queries = [
+                    query for query in context.captured_queries
+                    if 'posts_post' in query['sql']
+                    or 'auth_user' in query['sql']
+                    or 'posts_group' in query['sql']
+                ]
+                self.assertEqual(len(posts_queries), 1)
+
+    def test_batch_html_renders_cards_in_order(self):
+        """Проверка, что HTML - карточки постов подряд в порядке id."""
+        ids = [self.posts[1].pk, self.posts[0].pk, self.missing_id]
+        response = self.client.get(self.url, {
+            'ids': ','.join(map(str, ids)), 'format': 'html',
+        })
+        content = response.content.decode()
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+        self.assertLess(content.index(self.posts[1].text),
+                        content.index(self.posts[0].text))
+        self.assertNotIn(self.posts[2].text, content)
+        self.assertEqual(response['X-Missing-Posts'], str(self.missing_id))
+
+    @override_settings(POSTS_API_BATCH_LIMIT=2)
+    def test_batch_bad_requests(self):
+        """Проверка, что неверный список id или формат дают 400."""
+        ids = ','.join(str(post.pk) for post in self.posts)
+        for params in ({}, {'ids': 'один'}, {'ids': ids},
+                       {'ids': '1', 'format': 'xml'}, {'ids': '0'},
+                       {'ids': f'1,{2 ** 63}'}, {'ids': '-5'}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', json.loads(response.content))
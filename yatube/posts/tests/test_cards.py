@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts import cards
+from posts.cards import render_post_cards
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostsCardCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Тестовый пользователь')
+        cls.group = Group.objects.create(
+            title='Тестовое название',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.post = Post.objects.create(
+            text='Тестовый пост',
+            author=self.user,
+            group=self.group,
+        )
+
+    def render_card(self):
+        post = Post.objects.for_feed().get(pk=self.post.pk)
+        return render_post_cards([post])[post.pk]
+
+    def test_card_is_served_from_cache(self):
+        """Проверка, не отрисовывается ли карточка повторно."""
+        first_card = self.render_card()
+        with mock.patch.object(
+            cards, 'render_to_string', wraps=cards.render_to_string
+        ) as render:
+            self.assertEqual(self.render_card(), first_card)
+        render.assert_not_called()
+
+    def test_card_invalidated_on_post_edit(self):
+        """Проверка, обновляется ли карточка после правки поста."""
+        self.render_card()
+        client = Client()
+        client.force_login(self.user)
+        client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Исправленный текст', 'group': self.group.pk},
+        )
+        self.assertIn('Исправленный текст', self.render_card())
+
+    def test_card_invalidated_on_group_change(self):
+        """Проверка, обновляется ли карточка после смены адреса группы."""
+        self.render_card()
+        self.group.slug = 'new-slug'
+        self.group.save()
+        self.assertIn('/group/new-slug/', self.render_card())
+
+    def test_card_invalidated_on_author_change(self):
+        """Проверка, обновляется ли карточка после смены имени автора."""
+        self.render_card()
+        self.user.username = 'Новое имя'
+        self.user.save()
+        self.assertIn('Новое имя', self.render_card())
+
+    def test_feed_renders_cached_cards(self):
+        """Проверка, выводит ли главная страница карточку поста."""
+        response = Client().get(reverse('posts:index'))
+        self.assertContains(response, 'Тестовый пост')
+        self.assertContains(
+            response,
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostsConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Тестовый пользователь')
+        cls.group = Group.objects.create(
+            title='Тестовое название',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.post = Post.objects.create(
+            text='Тестовый пост',
+            author=self.user,
+            group=self.group,
+        )
+        self.guest_client = Client()
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+
+    def test_if_none_match_returns_not_modified(self):
+        """Проверка, отвечают ли страницы 304 на совпавший ETag."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=response['ETag']
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.NOT_MODIFIED
+                )
+
+    def test_if_modified_since_returns_not_modified(self):
+        """Проверка, отвечают ли страницы 304 на If-Modified-Since."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                response = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.NOT_MODIFIED
+                )
+
+    def test_feed_validators_skip_rendering(self):
+        """Проверка, не обращается ли ответ 304 ленты к базе данных."""
+        url = reverse('posts:index')
+        etag = self.guest_client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_post_edit_changes_validators(self):
+        """Проверка, меняется ли ETag страниц после правки поста."""
+        etags = {url: self.guest_client.get(url)['ETag'] for url in self.urls}
+        self.post.text = 'Исправленный пост'
+        self.post.save()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_etag_differs_between_users(self):
+        """Проверка, различаются ли ETag гостя и авторизованного автора."""
+        authorized_client = Client()
+        authorized_client.force_login(self.user)
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertNotEqual(
+                    self.guest_client.get(url)['ETag'],
+                    authorized_client.get(url)['ETag'],
+                )
+
+    def test_out_of_range_post_id_returns_not_found(self):
+        """Проверка, что id больше целого SQLite дает 404, а не 500."""
+        authorized_client = Client()
+        authorized_client.force_login(self.user)
+        for name in ('posts:post_detail', 'posts:post_edit'):
+            with self.subTest(name=name):
+                response = authorized_client.get(
+                    reverse(name, kwargs={'post_id': 10 ** 20})
+                )
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
@@ -0,0 +1,103 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.counters import author_posts_count
+from posts.models import AuthorCounter, Group, Post
+
+User = get_user_model()
+
+
+class PostsCountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Тестовый автор')
+        cls.first_group = Group.objects.create(
+            title='Первая группа',
+            slug='first',
+            description='Тестовое описание',
+        )
+        cls.second_group = Group.objects.create(
+            title='Вторая группа',
+            slug='second',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.post = Post.objects.create(
+            text='Тестовый пост',
+            author=self.author,
+            group=self.first_group,
+        )
+
+    def assertCounts(self, author_count, first_count, second_count):
+        self.author.refresh_from_db()
+        self.first_group.refresh_from_db()
+        self.second_group.refresh_from_db()
+        self.assertEqual(author_posts_count(self.author), author_count)
+        self.assertEqual(self.first_group.posts_count, first_count)
+        self.assertEqual(self.second_group.posts_count, second_count)
+
+    def test_counters_on_create_and_delete(self):
+        """Проверка счетчиков при создании и удалении поста."""
+        self.assertCounts(1, 1, 0)
+        Post.objects.create(text='Без группы', author=self.author)
+        self.assertCounts(2, 1, 0)
+        self.post.delete()
+        self.assertCounts(1, 0, 0)
+
+    def test_counters_on_group_change(self):
+        """Проверка счетчиков при смене группы поста."""
+        self.post.group = self.second_group
+        self.post.save()
+        self.assertCounts(1, 0, 1)
+        self.post.text = 'Новый текст'
+        self.post.save()
+        self.assertCounts(1, 0, 1)
+        self.post.group = None
+        self.post.save()
+        self.assertCounts(1, 0, 0)
+
+    def test_counters_on_admin_list_editable(self):
+        """Проверка счетчиков при смене группы в списке админки."""
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        client = Client()
+        client.force_login(admin)
+        client.post(reverse('admin:posts_post_changelist'), {
+            'form-TOTAL_FORMS': '1',
+            'form-INITIAL_FORMS': '1',
+            'form-0-id': self.post.pk,
+            'form-0-group': self.second_group.pk,
+            '_save': 'Сохранить',
+        })
+        self.assertCounts(1, 0, 1)
+
+    def test_rebuild_post_counters_command(self):
+        """Проверка, восстанавливает ли команда сбитые счетчики."""
+        AuthorCounter.objects.update(posts_count=42)
+        Group.objects.update(posts_count=42)
+        call_command('rebuild_post_counters', stdout=StringIO())
+        self.assertCounts(1, 1, 0)
+
+    def test_feed_pages_do_not_count_posts(self):
+        """Проверка, не считают ли профиль и группа строки постов."""
+        client = Client()
+        urls = (
+            reverse('posts:profile', kwargs={'username': self.author}),
+            reverse('posts:group_list', kwargs={'slug': 'first'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as context:
+                    response = client.get(url)
+                self.assertEqual(response.status_code, 200)
+                for query in context.captured_queries:
+                    self.assertNotIn('COUNT(', query['sql'].upper())
@@ -0,0 +1,84 @@
+import csv
+import json
+import os
+import tracemalloc
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.benchmarks import seed_posts
+from posts.exporters import export_jsonl
+from posts.models import Group, Post
+
+User = get_user_model()
+
+# полный прогон: POSTS_EXPORT_TEST_ROWS=1000000
+EXPORT_TEST_ROWS = int(os.environ.get('POSTS_EXPORT_TEST_ROWS', 10000))
+EXPORT_MEMORY_LIMIT = 4 * 1024 * 1024
+
+
+class PostsExportTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Тестовый пользователь')
+        cls.group = Group.objects.create(
+            title='Тестовое название',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый пост, с запятой',
+            author=cls.user,
+            group=cls.group,
+        )
+        Post.objects.create(text='Пост без группы', author=cls.user)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_export_command_jsonl(self):
+        """Проверка выгрузки командой в JSONL."""
+        output = StringIO()
+        call_command('export_posts', '--batch-size', '1', stdout=output)
+        records = [
+            json.loads(line) for line in output.getvalue().splitlines()
+        ]
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]['text'], self.post.text)
+        self.assertEqual(records[0]['author'], self.user.username)
+        self.assertEqual(records[0]['group'], self.group.slug)
+        self.assertIsNone(records[1]['group'])
+
+    def test_export_endpoint_csv(self):
+        """Проверка потоковой выгрузки CSV по адресу export."""
+        response = self.authorized_client.get(
+            reverse('posts:post_export') + '?format=csv'
+        )
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual(rows[0]['text'], self.post.text)
+        self.assertEqual(rows[1]['group'], '')
+
+    def test_export_endpoint_requires_login(self):
+        """Проверка, закрыта ли выгрузка от гостей."""
+        response = Client().get(reverse('posts:post_export'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_export_memory_is_bounded(self):
+        """Проверка, не зависит ли пиковая память выгрузки от числа строк."""
+        seed_posts(EXPORT_TEST_ROWS, author=self.user)
+        exported = 0
+        tracemalloc.start()
+        try:
+            for chunk in export_jsonl():
+                exported += chunk.count('\n')
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(exported, EXPORT_TEST_ROWS + 2)
+        self.assertLess(peak, EXPORT_MEMORY_LIMIT)
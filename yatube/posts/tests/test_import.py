@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostsImportCommandTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Тестовое название',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write(content)
+        return path
+
+    def write_jsonl(self, records):
+        return self.write_file('posts.jsonl', ''.join(
+            json.dumps(record, ensure_ascii=False) + '\n'
+            for record in records
+        ))
+
+    def import_posts(self, path, *args):
+        call_command('import_posts', path, *args, stdout=StringIO())
+
+    def test_import_jsonl(self):
+        """Проверка импорта JSONL с датой, группой и счетчиками."""
+        path = self.write_jsonl([
+            {'text': 'Первый', 'author': 'author', 'group': 'test-slug',
+             'pub_date': '2020-01-02T03:04:05+00:00'},
+            {'text': 'Второй', 'author': 'author'},
+            {'text': 'Чужой', 'author': 'nobody'},
+        ])
+        self.import_posts(path, '--batch-size', '2')
+        self.assertEqual(Post.objects.count(), 2)
+        post = Post.objects.get(text='Первый')
+        self.assertEqual(post.group, self.group)
+        self.assertEqual(
+            post.pub_date, datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        )
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 1)
+        self.assertEqual(self.user.post_counter.posts_count, 2)
+
+    def test_import_csv(self):
+        """Проверка импорта CSV."""
+        path = self.write_file(
+            'posts.csv',
+            'text,author,group,pub_date\n'
+            'Первый,author,test-slug,2020-01-02 03:04:05\n'
+            'Второй,author,,\n',
+        )
+        self.import_posts(path)
+        self.assertEqual(
+            set(Post.objects.values_list('text', flat=True)),
+            {'Первый', 'Второй'},
+        )
+
+    def test_import_rejects_non_object_lines(self):
+        """Проверка, что строка JSONL не с объектом дает CommandError."""
+        path = self.write_file(
+            'posts.jsonl', '{"text": "Первый", "author": "author"}\n[1, 2]\n'
+        )
+        with self.assertRaisesMessage(CommandError, 'строка 2'):
+            self.import_posts(path)
+        self.assertEqual(Post.objects.count(), 0)
+
+    def test_import_resumes_after_failure(self):
+        """Проверка, продолжается ли импорт после ошибки без дублей."""
+        records = [
+            {'text': f'Пост {number}', 'author': 'author'}
+            for number in range(5)
+        ]
+        records[3]['pub_date'] = 'не дата'
+        path = self.write_jsonl(records)
+        with self.assertRaises(CommandError):
+            self.import_posts(path, '--batch-size', '2')
+        self.assertEqual(Post.objects.count(), 2)
+
+        del records[3]['pub_date']
+        self.write_jsonl(records)
+        self.import_posts(path, '--batch-size', '2')
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            [f'Пост {number}' for number in range(5)],
+        )
+
+        self.import_posts(path, '--restart')
+        self.assertEqual(Post.objects.count(), 10)
@@ -0,0 +1,83 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+@skipUnless(connection.vendor == 'sqlite', 'План запроса проверяется в SQLite')
+class PostsFeedIndexesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Тестовый пользователь')
+        cls.group = Group.objects.create(
+            title='Тестовое название',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for count in range(15):
+            Post.objects.create(
+                text=f'Тестовый текст поста номер {count}',
+                author=cls.user,
+                group=cls.group,
+            )
+        cls.feed_urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user.username}),
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def feed_queries(self, url):
+        """SQL запросов к постам ленты, которые сортируют строки."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.guest_client.get(url)
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "posts_post"' in query['sql']
+            and 'ORDER BY' in query['sql']
+        ]
+        self.assertTrue(queries)
+        return response, queries
+
+    def assertUsesIndexedScan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            plan = ' | '.join(row[-1] for row in cursor.fetchall())
+        self.assertNotIn('TEMP B-TREE', plan, msg=sql)
+        self.assertRegex(plan, r'(SCAN|SEARCH) posts_post USING INDEX '
+                               r'post_\w+_idx', msg=sql)
+
+    def test_page_feeds_use_indexes(self):
+        """Проверка, сортируют ли ленты по индексу без временного дерева."""
+        for url in self.feed_urls:
+            for page in (1, 2):
+                with self.subTest(url=url, page=page):
+                    _, queries = self.feed_queries(f'{url}?page={page}')
+                    for sql in queries:
+                        self.assertUsesIndexedScan(sql)
+
+    @override_settings(POSTS_PAGINATION_MODE='cursor')
+    def test_cursor_feeds_use_indexes(self):
+        """Проверка планов запросов лент при пагинации по курсору."""
+        for url in self.feed_urls:
+            with self.subTest(url=url):
+                response, queries = self.feed_queries(url)
+                next_cursor = response.context['page_obj'].next_cursor
+                response, after_queries = self.feed_queries(
+                    f'{url}?after={next_cursor}'
+                )
+                previous_cursor = response.context['page_obj'].previous_cursor
+                _, before_queries = self.feed_queries(
+                    f'{url}?before={previous_cursor}'
+                )
+                for sql in queries + after_queries + before_queries:
+                    self.assertUsesIndexedScan(sql)
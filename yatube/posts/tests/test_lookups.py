@@ -0,0 +1,149 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.lookups import MISSING, LookupCache, lookup_cache
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class LookupCacheTests(TestCase):
+    def test_cache_evicts_least_recently_used(self):
+        """Проверка, что при переполнении вытесняется старая запись."""
+        cache = LookupCache(size=2, timeout=60)
+        cache.set('a', 1, 'A')
+        cache.set('b', 1, 'B')
+        cache.get('a', 1)
+        cache.set('c', 1, 'C')
+        self.assertIs(cache.get('b', 1), MISSING)
+        self.assertEqual(cache.get('a', 1), 'A')
+        self.assertEqual(cache.get('c', 1), 'C')
+
+    def test_cache_checks_stamp_and_timeout(self):
+        """Проверка, что запись устаревает по метке и по сроку."""
+        cache = LookupCache(size=10, timeout=60)
+        cache.set('a', 1, 'A')
+        self.assertIs(cache.get('a', 2), MISSING)
+        cache.set('a', 1, 'A')
+        with mock.patch('posts.lookups.time.monotonic',
+                        return_value=10 ** 9):
+            self.assertIs(cache.get('a', 1), MISSING)
+
+
+class PostsLookupsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Тестовый пользователь')
+        cls.group = Group.objects.create(
+            title='Тестовое название',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.create(text='Тестовый пост', author=cls.user,
+                            group=cls.group)
+
+    def setUp(self):
+        lookup_cache().clear()
+        self.client = Client()
+        self.group_url = reverse('posts:group_list',
+                                 kwargs={'slug': self.group.slug})
+        self.profile_url = reverse('posts:profile',
+                                   kwargs={'username': self.user.username})
+
+    def lookup_queries(self, url):
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        return response, [
+            query['sql'] for query in context.captured_queries
+            if '"posts_group"."slug" =' in query['sql']
+            or '"auth_user"."username" =' in query['sql']
+        ]
+
+    def test_repeated_requests_skip_lookup_queries(self):
+        """Проверка, что группа и автор берутся из кэша процесса."""
+        for url in (self.group_url, self.profile_url):
+            with self.subTest(url=url):
+                response, queries = self.lookup_queries(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(queries, [])
+
+    def test_repeated_requests_run_one_query(self):
+        """Проверка, что повторный запрос страницы - один запрос к базе."""
+        for url in (self.group_url, self.profile_url):
+            with self.subTest(url=url):
+                self.client.get(url)
+                with CaptureQueriesContext(connection) as context:
+                    self.client.get(url)
+                self.assertEqual(len(context.captured_queries), 1)
+
+    def test_missing_slug_is_cached_as_404(self):
+        """Проверка, что отсутствующая группа дает 404 и тоже кэшируется."""
+        url = reverse('posts:group_list', kwargs={'slug': 'missing'})
+        response, queries = self.lookup_queries(url)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(queries, [])
+
+    def test_admin_slug_edit_invalidates_lookup(self):
+        """Проверка, что правка slug в списке админки сбрасывает кэш."""
+        self.client.get(self.group_url)
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass',
+        )
+        self.client.force_login(admin)
+        response = self.client.post(reverse('admin:posts_group_changelist'), {
+            'form-TOTAL_FORMS': '1',
+            'form-INITIAL_FORMS': '1',
+            'form-MIN_NUM_FORMS': '0',
+            'form-MAX_NUM_FORMS': '1000',
+            'form-0-id': str(self.group.pk),
+            'form-0-slug': 'new-slug',
+            '_save': 'Сохранить',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.client.get(self.group_url).status_code, 404)
+        response = self.client.get(
+            reverse('posts:group_list', kwargs={'slug': 'new-slug'})
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_new_post_updates_cached_counts(self):
+        """Проверка, что новый пост обновляет счетчики на страницах."""
+        self.client.get(self.group_url)
+        self.client.get(self.profile_url)
+        Post.objects.create(text='Еще пост', author=self.user,
+                            group=self.group)
+        for url in (self.group_url, self.profile_url):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.context['page_obj'].paginator.count,
+                                 2)
+
+    def test_new_post_keeps_lookups(self):
+        """Проверка, что новый пост не сбрасывает группы и авторов в кэше."""
+        self.client.get(self.group_url)
+        self.client.get(self.profile_url)
+        Post.objects.create(text='Еще пост', author=self.user,
+                            group=self.group)
+        for url in (self.group_url, self.profile_url):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as context:
+                    self.client.get(url)
+                self.assertFalse([
+                    query for query in context.captured_queries
+                    if '"posts_group"."slug" =' in query['sql']
+                    or '"auth_user"."username" =' in query['sql']
+                ])
+
+    def test_user_change_invalidates_lookup(self):
+        """Проверка, что переименование пользователя сбрасывает кэш."""
+        self.client.get(self.profile_url)
+        user = User.objects.get(pk=self.user.pk)
+        user.username = 'Новое имя'
+        user.save()
+        self.assertEqual(self.client.get(self.profile_url).status_code, 404)
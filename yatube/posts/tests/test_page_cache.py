@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from posts.cache import page_cache_stats
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(POSTS_PAGE_CACHE_ENABLED=True)
+class PostsPageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Тестовый пользователь')
+        cls.group = Group.objects.create(
+            title='Тестовое название',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.feed_urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user.username}),
+        )
+
+    def setUp(self):
+        self.post = Post.objects.create(
+            text='Тестовый пост',
+            author=self.user,
+            group=self.group,
+        )
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_anonymous_feed_served_from_cache(self):
+        """Проверка, отдается ли повторный запрос ленты без базы данных."""
+        for url in self.feed_urls:
+            with self.subTest(url=url):
+                first = self.guest_client.get(url)
+                self.assertEqual(first['X-Page-Cache'], 'MISS')
+                with self.assertNumQueries(0):
+                    second = self.guest_client.get(url)
+                self.assertEqual(second['X-Page-Cache'], 'HIT')
+                self.assertEqual(second.content, first.content)
+
+    def test_cache_key_includes_page(self):
+        """Проверка, кэшируются ли страницы ленты по отдельности."""
+        self.guest_client.get(reverse('posts:index'))
+        response = self.guest_client.get(reverse('posts:index') + '?page=2')
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+
+    def test_post_create_invalidates_cache(self):
+        """Проверка, сбрасывает ли новый пост кэш лент."""
+        self.guest_client.get(reverse('posts:index'))
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Свежий пост', 'group': self.group.pk},
+        )
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, 'Свежий пост')
+
+    def test_post_edit_invalidates_cache(self):
+        """Проверка, сбрасывает ли правка поста кэш лент."""
+        self.guest_client.get(reverse('posts:index'))
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Исправленный пост', 'group': self.group.pk},
+        )
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Исправленный пост')
+
+    def test_authorized_user_is_not_cached(self):
+        """Проверка, не кэшируются ли страницы авторизованного автора."""
+        self.authorized_client.get(reverse('posts:index'))
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertNotIn('X-Page-Cache', response)
+
+    def test_page_cache_stats(self):
+        """Проверка, считаются ли попадания и промахи кэша."""
+        before = page_cache_stats()
+        self.guest_client.get(reverse('posts:index'))
+        self.guest_client.get(reverse('posts:index'))
+        after = page_cache_stats()
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
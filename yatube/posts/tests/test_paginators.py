@@ -0,0 +1,127 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from posts.models import Post
+from posts.paginators import (CursorPaginator, FeedPaginator, decode_cursor,
+                              encode_cursor)
+
+User = get_user_model()
+
+
+@override_settings(POSTS_PAGINATION_MODE='cursor')
+class PostsCursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Тестовый пользователь')
+        cls.posts = [
+            Post.objects.create(
+                text=f'Тестовый текст поста номер {count}',
+                author=cls.user,
+            )
+            for count in range(13)
+        ]
+        # одинаковые даты проверяют разрешение ничьих по id
+        Post.objects.update(pub_date=timezone.now())
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_cursor_round_trip(self):
+        """Проверка, восстанавливается ли курсор после кодирования."""
+        post = Post.objects.first()
+        self.assertEqual(
+            decode_cursor(encode_cursor(post)), (post.pub_date, post.pk)
+        )
+        self.assertIsNone(decode_cursor('мусор'))
+
+    def test_cursor_pages_cover_all_posts(self):
+        """Проверка, проходят ли курсоры все посты без повторов."""
+        response = self.guest_client.get(reverse('posts:index'))
+        first_page = response.context['page_obj']
+        self.assertEqual(len(first_page.object_list), 10)
+        self.assertFalse(first_page.has_previous())
+        self.assertTrue(first_page.has_next())
+
+        response = self.guest_client.get(
+            reverse('posts:index') + f'?after={first_page.next_cursor}'
+        )
+        second_page = response.context['page_obj']
+        self.assertEqual(len(second_page.object_list), 3)
+        self.assertFalse(second_page.has_next())
+        seen = [post.pk for post in first_page] + [
+            post.pk for post in second_page
+        ]
+        self.assertEqual(
+            seen, sorted((post.pk for post in self.posts), reverse=True)
+        )
+
+        response = self.guest_client.get(
+            reverse('posts:index') + f'?before={second_page.previous_cursor}'
+        )
+        back_page = response.context['page_obj']
+        self.assertEqual(list(back_page), list(first_page))
+        self.assertFalse(back_page.has_previous())
+
+    def test_cursor_page_skips_count(self):
+        """Проверка, обходится ли страница одним запросом без COUNT."""
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        with self.assertNumQueries(1):
+            page = paginator.get_cursor_page()
+            list(page)
+            page.has_other_pages()
+
+    def test_invalid_cursor_returns_first_page(self):
+        """Проверка, отдается ли первая страница при битом курсоре."""
+        response = self.guest_client.get(
+            reverse('posts:index') + '?after=broken'
+        )
+        page_obj = response.context['page_obj']
+        self.assertFalse(page_obj.has_previous())
+        self.assertEqual(len(page_obj.object_list), 10)
+
+
+class PostsFeedPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Тестовый пользователь')
+        for count in range(30):
+            Post.objects.create(
+                text=f'Тестовый текст поста номер {count}',
+                author=cls.user,
+            )
+
+    def test_page_window_is_elided(self):
+        """Проверка, показывает ли окно только края и соседей страницы."""
+        paginator = FeedPaginator(Post.objects.all(), 1)
+        self.assertEqual(
+            list(paginator.page(15).page_window),
+            [1, None, 13, 14, 15, 16, 17, None, 30],
+        )
+        self.assertEqual(
+            list(paginator.page(2).page_window),
+            [1, 2, 3, 4, None, 30],
+        )
+        self.assertEqual(
+            list(FeedPaginator(Post.objects.all(), 10).page(1).page_window),
+            [1, 2, 3],
+        )
+
+    def test_count_is_cached(self):
+        """Проверка, берется ли число постов из кэша."""
+        posts = Post.objects.filter(text__startswith='Тестовый')
+        self.assertEqual(FeedPaginator(posts, 10).count, 30)
+        with self.assertNumQueries(0):
+            self.assertEqual(FeedPaginator(posts, 10).count, 30)
+        Post.objects.create(text='Тестовый пост', author=self.user)
+        self.assertEqual(FeedPaginator(posts, 10).count, 31)
+
+    def test_paginator_renders_bounded_links(self):
+        """Проверка, не растет ли число ссылок пагинации с числом страниц."""
+        with override_settings(POSTS_PER_PAGE=1):
+            response = Client().get(reverse('posts:index') + '?page=15')
+        self.assertEqual(
+            response.content.decode().count('class="page-item'), 13
+        )
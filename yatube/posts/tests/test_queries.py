@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.models import Group, Post
+
+User = get_user_model()
+
+# запросы на страницу ленты не зависят от числа постов на ней
+FEED_QUERY_BUDGET = 4
+
+
+class PostsFeedQueriesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='Тестовое название',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for count in range(20):
+            author = User.objects.create_user(username=f'author_{count}')
+            Post.objects.create(
+                text=f'Тестовый текст поста номер {count}',
+                author=author,
+                group=cls.group,
+            )
+        cls.feed_urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': 'author_0'}),
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def count_queries(self, url):
+        # первый запрос прогревает кэш числа постов в paginator
+        self.guest_client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            self.guest_client.get(url)
+        return len(context.captured_queries)
+
+    def test_feed_queries_do_not_grow_with_page_size(self):
+        """Проверка, не растет ли число запросов вместе с размером страницы."""
+        for url in self.feed_urls:
+            with self.subTest(url=url):
+                with override_settings(POSTS_PER_PAGE=2):
+                    small_page = self.count_queries(url)
+                with override_settings(POSTS_PER_PAGE=20):
+                    large_page = self.count_queries(url)
+                self.assertEqual(small_page, large_page)
+                self.assertLessEqual(large_page, FEED_QUERY_BUDGET)
+
+    @override_settings(POSTS_PAGINATION_MODE='cursor')
+    def test_cursor_feed_queries_do_not_grow_with_page_size(self):
+        """Проверка бюджета запросов ленты при пагинации по курсору."""
+        for url in self.feed_urls:
+            with self.subTest(url=url):
+                with override_settings(POSTS_PER_PAGE=2):
+                    small_page = self.count_queries(url)
+                with override_settings(POSTS_PER_PAGE=20):
+                    large_page = self.count_queries(url)
+                self.assertEqual(small_page, large_page)
+                self.assertLessEqual(large_page, FEED_QUERY_BUDGET)
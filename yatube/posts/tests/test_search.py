@@ -0,0 +1,108 @@
+from core.testing import CommitCallbacksTestCase
+from django.contrib.auth import get_user_model
+from django.test import Client, override_settings
+from django.urls import reverse
+from posts import search
+from posts.models import Post
+
+User = get_user_model()
+
+
+class PostsSearchTests(CommitCallbacksTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+
+    def setUp(self):
+        search._backends.clear()
+        self.addCleanup(search._backends.clear)
+        self.post = Post.objects.create(
+            text='Весенний поход в горы', author=self.user
+        )
+        Post.objects.create(text='Осенний поход к морю', author=self.user)
+        self.client = Client()
+
+    def search(self, query, **params):
+        response = self.client.get(
+            reverse('posts:search'), {'q': query, **params}
+        )
+        return [post.text for post in response.context['page_obj']]
+
+    def test_search_finds_posts(self):
+        """Проверка, находит ли поиск посты по всем словам запроса."""
+        self.assertEqual(self.search('горы'), [self.post.text])
+        self.assertEqual(len(self.search('поход')), 2)
+        self.assertEqual(self.search('поход морю'), ['Осенний поход к морю'])
+        self.assertEqual(self.search('"; DROP'), [])
+
+    def test_search_without_words_finds_nothing(self):
+        """Проверка, что запрос без слов не ломает поиск."""
+        for query in ('!!!', '"'):
+            with self.subTest(query=query):
+                response = self.client.get(
+                    reverse('posts:search'), {'q': query}
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(list(response.context['page_obj']), [])
+
+    def test_search_follows_edit_and_delete(self):
+        """Проверка, обновляется ли индекс при правке и удалении поста."""
+        self.search('горы')
+        self.post.text = 'Весенний поход в лес'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.save()
+        self.assertEqual(self.search('горы'), [])
+        self.assertEqual(self.search('лес'), [self.post.text])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.delete()
+        self.assertEqual(self.search('лес'), [])
+
+    def test_search_ranks_relevant_posts_first(self):
+        """Проверка, выше ли в выдаче посты, где слово встречается чаще."""
+        relevant = Post.objects.create(
+            text='горы горы горы', author=self.user
+        )
+        self.assertEqual(
+            self.search('горы'), [relevant.text, self.post.text]
+        )
+
+    def test_search_is_paginated(self):
+        """Проверка, делится ли выдача на страницы с запросом в ссылках."""
+        for number in range(12):
+            Post.objects.create(text=f'Заметка {number}', author=self.user)
+        response = self.client.get(reverse('posts:search'), {'q': 'заметка'})
+        self.assertEqual(len(response.context['page_obj']), 10)
+        self.assertEqual(response.context['page_obj'].paginator.count, 12)
+        self.assertContains(response, '?q=%D0%B7')
+        self.assertEqual(len(self.search('заметка', page=2)), 2)
+
+    def test_admin_search_uses_index(self):
+        """Проверка поиска в списке постов админки."""
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'горы'}
+        )
+        self.assertEqual(
+            list(response.context['cl'].result_list), [self.post]
+        )
+        response = self.client.get(
+            reverse('admin:posts_post_changelist'), {'q': '!!!'}
+        )
+        self.assertEqual(list(response.context['cl'].result_list), [])
+
+
+@override_settings(POSTS_SEARCH_BACKEND='python')
+class PostsInvertedIndexSearchTests(PostsSearchTests):
+    """Те же проверки для индекса в памяти процесса."""
+
+    @override_settings(POSTS_SEARCH_MAX_IDS=1)
+    def test_admin_search_limits_ids(self):
+        """Проверка, что в фильтр админки попадают только лучшие посты."""
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'поход'}
+        )
+        self.assertEqual(len(response.context['cl'].result_list), 1)
@@ -0,0 +1,140 @@
+from io import StringIO
+
+from core.testing import CommitCallbacksTestCase
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, override_settings
+from django.urls import reverse
+from posts.models import Group, Post
+from posts.timelines import (TimelineSequence, invalidate_timelines,
+                             load_timeline)
+
+User = get_user_model()
+
+
+@override_settings(POSTS_TIMELINES_ENABLED=True)
+class PostsTimelinesTests(CommitCallbacksTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Тестовый пользователь')
+        cls.group = Group.objects.create(
+            title='Тестовое название',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        invalidate_timelines()
+        self.posts = [
+            Post.objects.create(
+                text=f'Тестовый пост {number}',
+                author=self.user,
+                group=self.group,
+            )
+            for number in range(3)
+        ]
+        self.posts.reverse()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def timeline(self, kind, pk):
+        return list(TimelineSequence(kind, pk)[0:100])
+
+    def warm_timelines(self):
+        for kind, pk in (('all', 'all'), ('user', self.user.pk),
+                         ('group', self.group.pk),
+                         ('group', self.other_group.pk)):
+            load_timeline(kind, pk)
+
+    def test_timeline_page_is_one_query(self):
+        """Проверка, читается ли страница ленты одним запросом."""
+        self.warm_timelines()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.timeline('all', 'all'), self.posts)
+
+    def test_created_post_fans_out(self):
+        """Проверка, попадает ли новый пост в ленты при создании."""
+        self.warm_timelines()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.authorized_client.post(
+                reverse('posts:post_create'),
+                data={'text': 'Новый пост', 'group': self.group.pk},
+            )
+        post = Post.objects.get(text='Новый пост')
+        for kind, pk in (('all', 'all'), ('user', self.user.pk),
+                         ('group', self.group.pk)):
+            with self.subTest(kind=kind):
+                self.assertEqual(self.timeline(kind, pk)[0], post)
+        self.assertEqual(self.timeline('group', self.other_group.pk), [])
+
+    def test_edit_and_delete_update_timelines(self):
+        """Проверка, переносится ли пост при смене группы и удаляется ли."""
+        self.warm_timelines()
+        post = self.posts[1]
+        post.group = self.other_group
+        with self.captureOnCommitCallbacks(execute=True):
+            post.save()
+        self.assertEqual(
+            self.timeline('group', self.group.pk),
+            [self.posts[0], self.posts[2]],
+        )
+        self.assertEqual(self.timeline('group', self.other_group.pk), [post])
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        self.assertEqual(self.timeline('group', self.other_group.pk), [])
+        self.assertEqual(
+            self.timeline('all', 'all'), [self.posts[0], self.posts[2]]
+        )
+
+    def test_timelines_change_after_commit(self):
+        """Проверка, меняются ли ленты только после фиксации транзакции."""
+        self.warm_timelines()
+        with self.captureOnCommitCallbacks() as callbacks:
+            post = Post.objects.create(text='Новый пост', author=self.user)
+        self.assertEqual(self.timeline('all', 'all'), self.posts)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.timeline('all', 'all'), [post, *self.posts])
+
+    @override_settings(POSTS_TIMELINE_LENGTH=2)
+    def test_timeline_is_trimmed(self):
+        """Проверка, обрезается ли лента и читается ли хвост из базы."""
+        self.warm_timelines()
+        complete, entries = load_timeline('all', 'all')
+        self.assertFalse(complete)
+        self.assertEqual(len(entries) // 2, 2)
+        post = Post.objects.create(text='Новый пост', author=self.user)
+        self.assertEqual(len(load_timeline('all', 'all')[1]) // 2, 2)
+        self.assertEqual(self.timeline('all', 'all'), [post, *self.posts])
+        self.assertEqual(TimelineSequence('all', 'all').count(), 4)
+
+    def test_feed_pages_match_query(self):
+        """Проверка, совпадают ли страницы лент с лентами из базы."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url)
+                self.assertEqual(
+                    list(response.context['page_obj']), self.posts
+                )
+
+    def test_rebuild_timelines_command(self):
+        """Проверка, перестраивает ли команда ленты после записи мимо ORM."""
+        self.warm_timelines()
+        Post.objects.bulk_create([Post(text='Новый пост', author=self.user)])
+        self.assertEqual(self.timeline('all', 'all'), self.posts)
+        call_command('rebuild_timelines', stdout=StringIO())
+        self.assertEqual(
+            self.timeline('all', 'all'),
+            [Post.objects.get(text='Новый пост'), *self.posts],
+        )
@@ -158,6 +158,14 @@ class PostsViewsTests(TestCase):
                 context = response.context[value]
                 self.assertEqual(context, expected)
 
+    def test_posts_post_detail_without_group(self):
+        """Проверка, открывается ли страница поста без группы."""
+        post = Post.objects.create(text='Без группы', author=self.user)
+        response = self.authorized_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': post.id})
+        )
+        self.assertEqual(response.status_code, 200)
+
     def test_posts_not_from_foreign_group(self):
         """
         Проверка, при указании группы поста, попадает
@@ -0,0 +1,127 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import reverse
+from posts import search
+from posts.counters import author_posts_count
+from posts.models import Post
+from posts.writer import PostWriter
+
+User = get_user_model()
+
+
+class PostWriterTests(TransactionTestCase):
+    """Фоновый поток пишет через свое соединение, поэтому без TestCase."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='Тестовый пользователь')
+        self.writer = PostWriter(queue_size=100, batch_size=10)
+        self.addCleanup(self.writer.stop)
+
+    def test_writer_saves_posts_in_batches(self):
+        """Проверка, что очередь сохраняет все посты и обновляет счетчики."""
+        futures = [
+            self.writer.submit(
+                Post(text=f'Пост {number}', author=self.user), timeout=1
+            )
+            for number in range(25)
+        ]
+        self.writer.flush()
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(Post.objects.filter(author=self.user).count(), 25)
+        self.assertEqual(author_posts_count(self.user), 25)
+
+    def test_wait_for_author_sees_own_posts(self):
+        """Проверка, что после ожидания автор видит свои посты."""
+        self.writer.submit(Post(text='Пост', author=self.user), timeout=1)
+        self.writer.wait_for_author(self.user.pk, timeout=5)
+        self.assertTrue(Post.objects.filter(author=self.user).exists())
+        self.assertFalse(self.writer.pending)
+
+    def test_full_queue_saves_synchronously(self):
+        """Проверка, что при полной очереди пост сохраняется в запросе."""
+        writer = PostWriter(queue_size=1, batch_size=10)
+        with mock.patch.object(writer, 'start'):
+            queued = writer.submit(Post(text='В очереди', author=self.user),
+                                   timeout=0)
+            saved = writer.submit(Post(text='Сразу', author=self.user),
+                                  timeout=0)
+        self.assertFalse(queued.done())
+        self.assertTrue(saved.done())
+        self.assertTrue(Post.objects.filter(text='Сразу').exists())
+        self.assertFalse(Post.objects.filter(text='В очереди').exists())
+
+    def test_failed_post_does_not_lose_batch(self):
+        """Проверка, что ошибка одного поста не отменяет остальные."""
+        with mock.patch.object(self.writer, 'start'):
+            good = self.writer.submit(
+                Post(text='Хороший', author=self.user), timeout=1
+            )
+            bad = self.writer.submit(Post(text='Плохой'), timeout=1)
+        with self.assertLogs('posts.writer', 'ERROR'):
+            self.writer.start()
+            self.writer.flush()
+        self.assertEqual(good.result().text, 'Хороший')
+        self.assertIsNotNone(bad.exception())
+        self.assertEqual(Post.objects.count(), 1)
+
+    def test_failed_batch_leaves_no_side_effects(self):
+        """Проверка, что откаченная пачка не попадает в индекс поиска."""
+        with mock.patch.object(self.writer, 'start'):
+            good = self.writer.submit(
+                Post(text='Хороший', author=self.user), timeout=1
+            )
+            self.writer.submit(Post(text='Плохой'), timeout=1)
+        backend = search.get_backend()
+        with mock.patch.object(backend, 'index_post') as index_post, \
+                self.assertLogs('posts.writer', 'ERROR') as logs:
+            self.writer.start()
+            self.writer.flush()
+        index_post.assert_called_once_with(good.result())
+        self.assertIn('не записан', logs.output[-1])
+
+    def test_stop_registered_at_exit_once(self):
+        """Проверка, что остановка регистрируется в atexit один раз."""
+        with mock.patch('posts.writer.atexit.register') as register:
+            for _ in range(2):
+                self.writer.start()
+                self.writer.stop()
+        register.assert_called_once_with(self.writer.stop)
+
+    def test_stop_flushes_queue(self):
+        """Проверка, что остановка дописывает очередь."""
+        for number in range(5):
+            self.writer.submit(
+                Post(text=f'Пост {number}', author=self.user), timeout=1
+            )
+        self.writer.stop()
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertFalse(self.writer.thread.is_alive())
+
+
+@override_settings(POSTS_WRITE_QUEUE_ENABLED=True)
+class PostCreateQueueTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='Тестовый пользователь')
+        self.client = Client()
+        self.client.force_login(self.user)
+        writer = PostWriter(queue_size=100, batch_size=10)
+        self.addCleanup(writer.stop)
+        patcher = mock.patch('posts.writer._writer', writer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_author_sees_post_after_redirect(self):
+        """Проверка, что автор видит свой пост в профиле после создания."""
+        response = self.client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Пост из очереди'},
+            follow=True,
+        )
+        self.assertRedirects(
+            response,
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+        )
+        self.assertContains(response, 'Пост из очереди')
+        self.assertEqual(response.context['page_obj'].paginator.count, 1)
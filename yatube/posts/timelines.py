@@ -0,0 +1,188 @@
+import bisect
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.functional import cached_property
+from posts.cache import bump_versions, get_versions, posts_cache
+from posts.models import Post
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# чтение и запись списка в кэше не атомарны, запись ведется под замком
+_lock = threading.Lock()
+
+
+def timeline_entry(pub_date, pk):
+    """Элемент ленты; по возрастанию элементы идут от новых постов к старым."""
+    return (-((pub_date - EPOCH) // timedelta(microseconds=1)), -pk)
+
+
+def timeline_queryset(kind, pk):
+    queryset = Post.objects.all()
+    if kind == 'user':
+        return queryset.filter(author_id=pk)
+    if kind == 'group':
+        return queryset.filter(group_id=pk)
+    return queryset
+
+
+def timeline_keys(pairs):
+    generation = get_versions([('timeline', 'all')])[('timeline', 'all')]
+    return {
+        f'posts:timeline:{generation}:{kind}:{pk}': (kind, pk)
+        for kind, pk in pairs
+    }
+
+
+def post_timelines(author_id, group_id):
+    if author_id is None:
+        return set()
+    pairs = {('all', 'all'), ('user', author_id)}
+    if group_id is not None:
+        pairs.add(('group', group_id))
+    return pairs
+
+
+def pack_entries(entries):
+    # плоский массив чисел распаковывается из кэша в разы быстрее
+    # списка кортежей
+    return array('q', chain.from_iterable(entries)).tobytes()
+
+
+def unpack_entries(data):
+    values = array('q')
+    values.frombytes(data)
+    return values
+
+
+def load_timeline(kind, pk):
+    """
+    Пара (complete, entries) из кэша, entries - плоский массив элементов
+    ленты. При промахе лента строится одним запросом. complete - в ленте
+    все посты, а не только последние.
+    """
+    [(key, _)] = timeline_keys([(kind, pk)]).items()
+    cache = posts_cache()
+    timeline = cache.get(key)
+    if timeline is None:
+        length = settings.POSTS_TIMELINE_LENGTH
+        rows = timeline_queryset(kind, pk).values_list('pub_date', 'id')
+        entries = [timeline_entry(*row) for row in rows[:length + 1]]
+        timeline = (len(entries) <= length, pack_entries(entries[:length]))
+        cache.set(key, timeline, timeout=settings.POSTS_TIMELINE_TIMEOUT)
+    complete, data = timeline
+    return complete, unpack_entries(data)
+
+
+def insert_entry(complete, entries, entry):
+    # пост старше обрезанного хвоста: между ними могут быть другие посты
+    if not complete and (not entries or entry > entries[-1]):
+        return complete, entries
+    bisect.insort(entries, entry)
+    length = settings.POSTS_TIMELINE_LENGTH
+    if len(entries) > length:
+        del entries[length:]
+        complete = False
+    return complete, entries
+
+
+def remove_entry(complete, entries, entry):
+    index = bisect.bisect_left(entries, entry)
+    if index < len(entries) and entries[index] == entry:
+        del entries[index]
+    return complete, entries
+
+
+def update_timelines(post, old_author_id=None, old_group_id=None,
+                     deleted=False, using=None):
+    """
+    Разносит пост по лентам автора, группы и общей ленте, а из прежних
+    лент убирает. Меняются только ленты, которые уже есть в кэше,
+    остальные построятся при чтении. Кэш меняется после фиксации
+    транзакции, при откате ленты остаются прежними.
+    """
+    old = post_timelines(old_author_id, old_group_id)
+    new = set() if deleted else post_timelines(post.author_id, post.group_id)
+    changes = {pair: remove_entry for pair in old - new}
+    changes.update({pair: insert_entry for pair in new - old})
+    if not changes:
+        return
+    # после удаления у поста уже не будет pk
+    entry = timeline_entry(post.pub_date, post.pk)
+    transaction.on_commit(
+        lambda: apply_timeline_changes(changes, entry), using=using
+    )
+
+
+def apply_timeline_changes(changes, entry):
+    keys = timeline_keys(changes)
+    cache = posts_cache()
+    with _lock:
+        timelines = cache.get_many(keys)
+        for key, (complete, data) in timelines.items():
+            values = unpack_entries(data)
+            complete, entries = changes[keys[key]](
+                complete, list(zip(values[::2], values[1::2])), entry
+            )
+            timelines[key] = (complete, pack_entries(entries))
+        cache.set_many(timelines, timeout=settings.POSTS_TIMELINE_TIMEOUT)
+
+
+def invalidate_timelines():
+    """Сбрасывает все ленты, например после импорта в обход ORM."""
+    bump_versions('timeline', 'all')
+
+
+class TimelineSequence:
+    """
+    Лента из кэша для FeedPaginator: страница - один запрос in_bulk
+    по id. Страницы дальше сохраненной части ленты читаются из базы.
+    """
+
+    def __init__(self, kind, pk):
+        self.kind = kind
+        self.pk = pk
+        self.queryset = timeline_queryset(kind, pk).for_feed()
+
+    @property
+    def query(self):
+        # FeedPaginator кэширует число постов по тексту запроса
+        return self.queryset.query
+
+    @cached_property
+    def timeline(self):
+        return load_timeline(self.kind, self.pk)
+
+    def count(self):
+        complete, entries = self.timeline
+        if complete:
+            return len(entries) // 2
+        return self.queryset.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        complete, entries = self.timeline
+        start = key.start or 0
+        if not complete and key.stop > len(entries) // 2:
+            return list(self.queryset[key])
+        ids = [-pk for pk in entries[2 * start + 1:2 * key.stop:2]]
+        posts = self.queryset.in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+def feed_posts(kind, pk, queryset):
+    """Посты ленты: из кэша лент, если он включен, иначе запрос queryset."""
+    if (
+        settings.POSTS_TIMELINES_ENABLED
+        and settings.POSTS_PAGINATION_MODE == 'page'
+    ):
+        return TimelineSequence(kind, pk)
+    return queryset
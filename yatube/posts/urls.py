@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import api, views
 
 app_name = 'posts'
 
@@ -11,4 +11,14 @@ urlpatterns = [
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path('search/', views.post_search, name='search'),
+    path('export/', views.post_export, name='post_export'),
+    path('api/posts/', api.index, name='api_index'),
+    path('api/posts/batch/', api.post_batch, name='api_post_batch'),
+    path('api/posts/<int:post_id>/', api.post_detail,
+         name='api_post_detail'),
+    path('api/groups/<slug:slug>/posts/', api.group_list,
+         name='api_group_list'),
+    path('api/profiles/<str:username>/posts/', api.profile,
+         name='api_profile'),
 ]
@@ -0,0 +1,21 @@
+import threading
+
+from posts.models import Post
+
+_pub_date_lock = threading.Lock()
+
+
+def bulk_create_with_pub_date(posts):
+    """
+    Сохраняет посты через bulk_create с заданной pub_date (нужно для
+    наполнения базы замеров и тестов): на время вставки отключает
+    auto_now_add. Флаг поля общий для процесса, поэтому функция только
+    для команд и тестов, где другие потоки в это время постов не пишут.
+    """
+    field = Post._meta.get_field('pub_date')
+    with _pub_date_lock:
+        field.auto_now_add = False
+        try:
+            return Post.objects.bulk_create(posts)
+        finally:
+            field.auto_now_add = True
@@ -1,61 +1,119 @@
+from core.routers import read_from_replica
 from django.conf import settings
-from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.http import urlencode
+from django.views.decorators.http import condition
+from posts.cache import anonymous_page_cache
+from posts.cards import prefetch_post_cards
+from posts.conditions import feed_etag, feed_last_modified, post_etag
+from posts.counters import (author_posts_count, current_author_posts_count,
+                            current_group_posts_count)
+from posts.exporters import EXPORT_FORMATS, EXPORTERS
 from posts.forms import PostForm
-from posts.models import Group, Post
-
-User = get_user_model()
+from posts.lookups import author_by_username, group_by_slug
+from posts.models import MAX_ID, Post
+from posts.paginators import FeedPaginator, paginate
+from posts.search import SearchResults
+from posts.timelines import feed_posts
+from posts.writer import read_own_writes, save_post
 
 
+@read_from_replica
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+@anonymous_page_cache
 def index(request):
-    posts = Post.objects.all()
-    paginator = Paginator(posts, settings.POSTS_PER_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = prefetch_post_cards(
+        paginate(request, feed_posts('all', 'all', Post.objects.for_feed()))
+    )
     context = {
         'page_obj': page_obj,
-        'paginator': paginator,
+        'paginator': page_obj.paginator,
     }
     return render(request, 'posts/index.html', context)
 
 
+@read_own_writes
+@read_from_replica
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+@anonymous_page_cache
 def profile(request, username):
-    user_obj = get_object_or_404(User, username=username)
-    posts = user_obj.posts.all()
-    paginator = Paginator(posts, settings.POSTS_PER_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    user_obj = author_by_username(username)
+    if user_obj is None:
+        raise Http404
+    posts_count = current_author_posts_count(user_obj.pk)
+    page_obj = prefetch_post_cards(
+        paginate(
+            request,
+            feed_posts('user', user_obj.pk, user_obj.posts.for_feed()),
+            posts_count,
+        )
+    )
     context = {
         'user_obj': user_obj,
+        'posts_count': posts_count,
         'page_obj': page_obj,
     }
     return render(request, 'posts/profile.html', context)
 
 
+@read_from_replica
+@condition(etag_func=post_etag, last_modified_func=feed_last_modified)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    if not 1 <= post_id <= MAX_ID:
+        raise Http404
+    post = get_object_or_404(
+        Post.objects.for_feed().select_related('author__post_counter'),
+        pk=post_id,
+    )
     context = {
         'post': post,
+        'author_posts_count': author_posts_count(post.author),
     }
     return render(request, 'posts/post_detail.html', context)
 
 
+@read_from_replica
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+@anonymous_page_cache
 def group_list(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
-    paginator = Paginator(posts, settings.POSTS_PER_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    group = group_by_slug(slug)
+    if group is None:
+        raise Http404
+    page_obj = prefetch_post_cards(
+        paginate(
+            request,
+            feed_posts('group', group.pk, group.posts.for_feed()),
+            current_group_posts_count(group.pk),
+        )
+    )
     context = {
         'group': group,
-        'paginator': paginator,
+        'paginator': page_obj.paginator,
         'page_obj': page_obj,
     }
     return render(request, 'posts/group_list.html', context)
 
 
+def post_search(request):
+    query = request.GET.get('q', '').strip()
+    page_obj = None
+    if query:
+        paginator = FeedPaginator(
+            SearchResults(query), settings.POSTS_PER_PAGE
+        )
+        page_obj = prefetch_post_cards(
+            paginator.get_page(request.GET.get('page'))
+        )
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+        'page_query': urlencode({'q': query}) + '&',
+    }
+    return render(request, 'posts/search.html', context)
+
+
 @login_required
 def post_create(request):
     form = PostForm(data=request.POST)
@@ -69,11 +127,13 @@ def post_create(request):
 
     post = form.save(commit=False)
     post.author = request.user
-    post.save()
+    save_post(post)
     return redirect('posts:profile', post.author)
 
 
 def post_edit(request, post_id):
+    if not 1 <= post_id <= MAX_ID:
+        raise Http404
     is_edit = get_object_or_404(Post, pk=post_id)
     form = PostForm(request.POST, instance=is_edit)
 
@@ -94,3 +154,18 @@ def post_edit(request, post_id):
 
     form.save()
     return redirect('posts:post_detail', post_id)
+
+
+@login_required
+def post_export(request):
+    export_format = request.GET.get('format', 'jsonl')
+    if export_format not in EXPORTERS:
+        raise Http404
+    response = StreamingHttpResponse(
+        EXPORTERS[export_format](),
+        content_type=EXPORT_FORMATS[export_format],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="posts.{export_format}"'
+    )
+    return response
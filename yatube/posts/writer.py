@@ -0,0 +1,186 @@
+import atexit
+import logging
+import queue
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, wait
+from functools import wraps
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+STOP = object()
+
+
+class PostWriter:
+    """
+    Очередь записи постов: фоновый поток сохраняет накопившиеся посты
+    пачкой в одной транзакции, и при всплеске запросов блокировка
+    записи SQLite берется один раз на пачку, а не на каждый пост.
+    Сохранение идет через save(), поэтому сигналы срабатывают как обычно.
+    """
+
+    def __init__(self, queue_size, batch_size):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.pending = defaultdict(set)
+        self.thread = None
+        self.stop_at_exit = False
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(
+                target=self.run, name='post-writer', daemon=True
+            )
+            self.thread.start()
+            if not self.stop_at_exit:
+                atexit.register(self.stop)
+                self.stop_at_exit = True
+
+    def submit(self, post, timeout):
+        """
+        Ставит пост в очередь. Если очередь не освободилась за timeout
+        секунд, пост сохраняется сразу в потоке запроса.
+        """
+        future = Future()
+        author_id = post.author_id
+        with self.lock:
+            self.pending[author_id].add(future)
+        future.add_done_callback(
+            lambda done: self.forget(author_id, done)
+        )
+        self.start()
+        try:
+            self.queue.put((post, future), timeout=timeout)
+        except queue.Full:
+            self.save_one(post, future)
+        return future
+
+    def forget(self, author_id, future):
+        with self.lock:
+            futures = self.pending.get(author_id)
+            if futures is not None:
+                futures.discard(future)
+                if not futures:
+                    del self.pending[author_id]
+
+    def wait_for_author(self, author_id, timeout=None):
+        """Ждет записи постов автора, поставленных в очередь раньше."""
+        with self.lock:
+            futures = set(self.pending.get(author_id, ()))
+        if futures:
+            wait(futures, timeout=timeout)
+
+    def flush(self):
+        self.queue.join()
+
+    def stop(self):
+        """Дописывает очередь и останавливает поток."""
+        thread = self.thread
+        if thread is None or not thread.is_alive():
+            return
+        self.queue.put(STOP)
+        thread.join()
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            item = self.queue.get()
+            while True:
+                if item is STOP:
+                    stopping = True
+                    self.queue.task_done()
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self.write_batch(batch)
+        close_old_connections()
+
+    def write_batch(self, batch):
+        close_old_connections()
+        try:
+            # кэши и индекс поиска сигналы меняют после фиксации, поэтому
+            # откаченная пачка не оставляет в них следов
+            with transaction.atomic():
+                for post, _ in batch:
+                    post.save()
+        except Exception:
+            logger.exception('Пачка постов не записана, пишем по одному')
+            for post, future in batch:
+                post.pk = None
+                post._state.adding = True
+                self.save_one(post, future)
+        else:
+            for post, future in batch:
+                future.set_result(post)
+        finally:
+            for _ in batch:
+                self.queue.task_done()
+
+    def save_one(self, post, future):
+        try:
+            post.save()
+        except Exception as error:
+            # запрос автора уже завершен, узнать о потере можно из лога
+            logger.exception(
+                'Пост автора %s не записан: %r', post.author_id, post.text
+            )
+            future.set_exception(error)
+        else:
+            future.set_result(post)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def post_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = PostWriter(
+                settings.POSTS_WRITE_QUEUE_SIZE,
+                settings.POSTS_WRITE_BATCH_SIZE,
+            )
+    return _writer
+
+
+def save_post(post):
+    """Сохраняет пост сразу или через очередь записи, если она включена."""
+    if not settings.POSTS_WRITE_QUEUE_ENABLED:
+        post.save()
+        return
+    post_writer().submit(post, timeout=settings.POSTS_WRITE_QUEUE_TIMEOUT)
+
+
+def read_own_writes(view):
+    """
+    Перед ответом автору дожидается записи его постов из очереди.
+    Работает только внутри одного процесса: очередь и список ожидающих
+    постов у каждого процесса свои, и если сервер запущен несколькими
+    процессами, запрос, попавший в другой процесс, может не увидеть
+    пост автора, пока фоновый поток первого его не сохранит.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (
+            settings.POSTS_WRITE_QUEUE_ENABLED
+            and request.user.is_authenticated
+        ):
+            post_writer().wait_for_author(
+                request.user.pk, timeout=settings.POSTS_WRITE_QUEUE_TIMEOUT
+            )
+        return view(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.core.exceptions import PermissionDenied
+
+
+def user_cache():
+    return caches[settings.USERS_CACHE]
+
+
+def user_cache_key(user_id):
+    return f'users:user:{user_id}'
+
+
+def forget_user(user_id):
+    user_cache().delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend, который берет пользователя сессии из кэша, а не из
+    auth_user на каждом запросе. Запись сбрасывается при сохранении и
+    удалении пользователя (смена пароля, last_login) и при выходе.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(
+            request, username=username, password=password, **kwargs
+        )
+        # ModelBackend после этого бэкенда нужен только сессиям, открытым
+        # до его подключения: неверный пароль не хэшируется второй раз
+        if user is None and password is not None:
+            raise PermissionDenied
+        return user
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = user_cache().get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                user_cache().set(key, user, settings.SESSION_COOKIE_AGE)
+        return user
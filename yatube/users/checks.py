@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+LOCAL_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_session_cache(app_configs, **kwargs):
+    """
+    Без отладки сессии и пользователи сессий должны лежать в общем для
+    процессов кэше: locmem каждого процесса не видит выход и смену
+    пароля в других процессах.
+    """
+    if settings.DEBUG:
+        return []
+    errors = []
+    for name in ('SESSION_CACHE_ALIAS', 'USERS_CACHE'):
+        alias = getattr(settings, name)
+        if settings.CACHES[alias]['BACKEND'] == LOCAL_CACHE:
+            errors.append(Error(
+                f'{name} указывает на кэш {alias!r} в памяти процесса.',
+                hint='Укажите для него memcached или другой общий кэш.',
+                obj=name,
+                id='users.E001',
+            ))
+    return errors
@@ -0,0 +1,123 @@
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def hash_pool():
+    global _pool, _pool_workers
+    workers = settings.PASSWORD_HASHING_WORKERS
+    with _pool_lock:
+        if _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix='hasher'
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def run_in_pool(func, *args):
+    """
+    Считает хэш в пуле из PASSWORD_HASHING_WORKERS потоков. При всплеске
+    входов и регистраций остальные запросы ждут в очереди пула, а не
+    делят ядра с хэшированием, и ленты продолжают отвечать.
+    """
+    return hash_pool().submit(func, *args).result()
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 с числом итераций из PASSWORD_PBKDF2_ITERATIONS."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+    def encode(self, password, salt, iterations=None):
+        return run_in_pool(super().encode, password, salt, iterations)
+
+
+class ScryptPasswordHasher(hashers.BasePasswordHasher):
+    """
+    scrypt из hashlib с параметрами из PASSWORD_SCRYPT. Формат строки
+    тот же, что у ScryptPasswordHasher в Django 4.0, чтобы хэши
+    пережили обновление Django.
+    """
+
+    algorithm = 'scrypt'
+    dklen = 64
+
+    def params(self):
+        return (
+            settings.PASSWORD_SCRYPT['work_factor'],
+            settings.PASSWORD_SCRYPT['block_size'],
+            settings.PASSWORD_SCRYPT['parallelism'],
+        )
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        if n is None:
+            n, r, p = self.params()
+        hash_ = run_in_pool(partial(
+            hashlib.scrypt, password.encode(), salt=salt.encode(),
+            n=n, r=r, p=p, dklen=self.dklen,
+            # память scrypt - 128 * n * r байт, берем с запасом
+            maxmem=256 * n * r,
+        ))
+        hash_ = base64.b64encode(hash_).decode('ascii').strip()
+        return f'{self.algorithm}${n}${salt}${r}${p}${hash_}'
+
+    def decode(self, encoded):
+        algorithm, n, salt, r, p, hash_ = encoded.split('$', 5)
+        assert algorithm == self.algorithm
+        return {
+            'work_factor': int(n),
+            'salt': salt,
+            'block_size': int(r),
+            'parallelism': int(p),
+            'hash': hash_,
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(
+            password, decoded['salt'], decoded['work_factor'],
+            decoded['block_size'], decoded['parallelism'],
+        )
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return OrderedDict([
+            (_('algorithm'), self.algorithm),
+            (_('work factor'), decoded['work_factor']),
+            (_('block size'), decoded['block_size']),
+            (_('parallelism'), decoded['parallelism']),
+            (_('salt'), hashers.mask_hash(decoded['salt'])),
+            (_('hash'), hashers.mask_hash(decoded['hash'])),
+        ])
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (
+            decoded['work_factor'], decoded['block_size'],
+            decoded['parallelism'],
+        ) != self.params()
+
+    def harden_runtime(self, password, encoded):
+        # время scrypt почти не зависит от того, насколько устарели
+        # параметры, добирать его нечем
+        pass
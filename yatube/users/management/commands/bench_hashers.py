@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+
+from core.timing import percentiles
+from django.conf import settings
+from django.contrib.auth import authenticate, get_user_model
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from posts.benchmarks import benchmark_database
+
+User = get_user_model()
+
+PASSWORD = 'Пароль-для-замера-1'
+
+PROFILES = {
+    'pbkdf2': {
+        'PASSWORD_HASHERS': ['users.hashers.PBKDF2PasswordHasher'],
+    },
+    'scrypt': {
+        'PASSWORD_HASHERS': ['users.hashers.ScryptPasswordHasher'],
+    },
+}
+
+
+class Command(BaseCommand):
+    help = ('Замер входов в секунду на ядро: authenticate() из нескольких '
+            'потоков с хэшерами PBKDF2 и scrypt при параметрах из '
+            'настроек.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int,
+                            default=(os.cpu_count() or 1) * 4,
+                            help='Потоков, одновременно входящих в систему.')
+        parser.add_argument('--duration', type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        cores = os.cpu_count() or 1
+        self.stdout.write(
+            f'Ядер {cores}, потоков {options["threads"]}, пул хэширования '
+            f'{settings.PASSWORD_HASHING_WORKERS}.'
+        )
+        with benchmark_database():
+            for name, profile in PROFILES.items():
+                with override_settings(**profile):
+                    user = User.objects.create_user(
+                        username=f'bench_{name}', password=PASSWORD
+                    )
+                    logins, latencies = self.run(
+                        user.username, options['threads'],
+                        options['duration'],
+                    )
+                cuts = percentiles(latencies)
+                rate = logins / options['duration']
+                self.stdout.write(
+                    f'{name:<7} {rate:7.1f} входов/с, '
+                    f'{rate / cores:7.1f} на ядро, '
+                    f'p50 {cuts["p50"]:7.1f} мс, p95 {cuts["p95"]:7.1f} мс'
+                )
+
+    def run(self, username, threads, duration):
+        deadline = time.perf_counter() + duration
+        latencies = []
+        lock = threading.Lock()
+
+        def worker():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                user = authenticate(username=username, password=PASSWORD)
+                elapsed = (time.perf_counter() - started) * 1000
+                assert user is not None
+                with lock:
+                    latencies.append(elapsed)
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return len(latencies), latencies
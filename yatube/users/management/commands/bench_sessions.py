@@ -0,0 +1,88 @@
+import statistics
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test import override_settings
+from django.urls import reverse
+from posts.benchmarks import (auth_headers, benchmark_database, call_wsgi,
+                              seed_dataset)
+from posts.models import Post
+
+User = get_user_model()
+
+PROFILES = {
+    'база': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'AUTHENTICATION_BACKENDS': [
+            'django.contrib.auth.backends.ModelBackend',
+        ],
+    },
+    'кэш': {
+        'SESSION_ENGINE': settings.SESSION_ENGINE,
+        'AUTHENTICATION_BACKENDS': settings.AUTHENTICATION_BACKENDS,
+    },
+}
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает SQL-запросы и время ответа страниц для вошедшего '
+            'пользователя с сессиями в базе и с сессиями и пользователем '
+            'из кэша.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов на каждую страницу.')
+        parser.add_argument('--posts', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        with benchmark_database(), override_settings(
+            DEBUG=False, ALLOWED_HOSTS=['127.0.0.1'],
+        ):
+            author_ids, _ = seed_dataset(
+                users=10, groups=2, posts=options['posts']
+            )
+            user = User.objects.get(pk=author_ids[0])
+            paths = {
+                'index': reverse('posts:index'),
+                'profile': reverse('posts:profile',
+                                   kwargs={'username': user.username}),
+                'post_detail': reverse(
+                    'posts:post_detail',
+                    kwargs={'post_id': Post.objects.values_list(
+                        'pk', flat=True).first()},
+                ),
+            }
+            for name, profile in PROFILES.items():
+                with override_settings(**profile):
+                    # SessionMiddleware выбирает движок при создании,
+                    # поэтому приложение свое на каждый профиль
+                    application = get_wsgi_application()
+                    headers = auth_headers(user)
+                    for view, path in paths.items():
+                        self.report(name, view, self.run(
+                            application, path, headers, options['requests']
+                        ))
+
+    def run(self, application, path, headers, count):
+        # первый запрос прогревает кэши страницы и сессии
+        call_wsgi(application, 'GET', path, headers=headers)
+        latencies = []
+        queries = []
+        for _ in range(count):
+            status, latency, query_count = call_wsgi(
+                application, 'GET', path, headers=headers
+            )
+            if status != 200:
+                raise CommandError(f'{path}: ответ {status}.')
+            latencies.append(latency)
+            queries.append(query_count)
+        return statistics.median(latencies), statistics.mean(queries)
+
+    def report(self, profile, view, result):
+        latency, queries = result
+        self.stdout.write(
+            f'{profile:<5} {view:<12} SQL {queries:5.1f}, '
+            f'p50 {latency:7.2f} мс'
+        )
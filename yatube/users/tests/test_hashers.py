@@ -0,0 +1,69 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import (check_password, identify_hasher,
+                                         make_password)
+from django.test import Client, TestCase, override_settings
+
+User = get_user_model()
+
+# небольшие параметры, чтобы тесты не тратили время на хэширование
+FAST_SCRYPT = {'work_factor': 2 ** 8, 'block_size': 8, 'parallelism': 1}
+
+
+@override_settings(PASSWORD_SCRYPT=FAST_SCRYPT,
+                   PASSWORD_PBKDF2_ITERATIONS=1000)
+class PasswordHashersTests(TestCase):
+    def test_new_passwords_use_scrypt(self):
+        """Проверка, что новые пароли хэшируются scrypt и проверяются."""
+        encoded = make_password('Пароль-123')
+        self.assertTrue(encoded.startswith('scrypt$256$'))
+        self.assertTrue(check_password('Пароль-123', encoded))
+        self.assertFalse(check_password('другой', encoded))
+
+    def test_changed_parameters_need_update(self):
+        """Проверка, что хэш с прежними параметрами нужно пересчитать."""
+        encoded = make_password('Пароль-123')
+        hasher = identify_hasher(encoded)
+        self.assertFalse(hasher.must_update(encoded))
+        with override_settings(PASSWORD_SCRYPT={**FAST_SCRYPT,
+                                                'work_factor': 2 ** 9}):
+            self.assertTrue(hasher.must_update(encoded))
+
+    def test_login_rehashes_old_hash(self):
+        """Проверка, что вход пересчитывает хэш PBKDF2 в scrypt."""
+        user = User.objects.create(
+            username='Тестовый пользователь',
+            password=make_password('Пароль-123', hasher='pbkdf2_sha256'),
+        )
+        self.assertTrue(Client().login(username=user.username,
+                                       password='Пароль-123'))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$'))
+
+    @override_settings(PASSWORD_HASHING_WORKERS=2)
+    def test_pool_bounds_concurrent_hashing(self):
+        """Проверка, что пул ограничивает число одновременных хэшей."""
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def slow_pbkdf2(*args, **kwargs):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return b'0' * 32
+
+        with mock.patch('django.contrib.auth.hashers.pbkdf2', slow_pbkdf2):
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                list(executor.map(
+                    lambda _: make_password('Пароль', hasher='pbkdf2_sha256'),
+                    range(6),
+                ))
+        self.assertEqual(max(peak), 2)
@@ -0,0 +1,122 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import authenticate, get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from users.backends import user_cache, user_cache_key
+from users.checks import check_shared_session_cache
+
+User = get_user_model()
+
+DATABASE_SESSIONS = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+    'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+}
+
+
+class CachedSessionsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='Тестовый пользователь', password='old-password-1',
+        )
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def session_queries(self, url):
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        return [
+            query['sql'] for query in context.captured_queries
+            if 'django_session' in query['sql']
+            or 'FROM "auth_user"' in query['sql']
+        ]
+
+    def test_authenticated_page_skips_session_and_user_queries(self):
+        """Проверка, что сессия и пользователь берутся из кэша."""
+        self.assertEqual(self.session_queries(reverse('posts:index')), [])
+
+    @override_settings(**DATABASE_SESSIONS)
+    def test_database_sessions_query_every_request(self):
+        """Проверка, что без кэша сессия и пользователь читаются из базы."""
+        self.client.force_login(self.user)
+        self.assertEqual(len(self.session_queries(reverse('posts:index'))), 2)
+
+    def test_user_save_invalidates_cache(self):
+        """Проверка, что сохранение пользователя сбрасывает кэш."""
+        self.client.get(reverse('posts:index'))
+        key = user_cache_key(self.user.pk)
+        self.assertIsNotNone(user_cache().get(key))
+        self.user.first_name = 'Новое имя'
+        self.user.save()
+        self.assertIsNone(user_cache().get(key))
+        response = self.client.get(reverse('posts:index'))
+        self.assertEqual(response.wsgi_request.user.first_name, 'Новое имя')
+
+    def test_password_change_logs_out_other_sessions(self):
+        """Проверка, что после смены пароля другие сессии не работают."""
+        other_client = Client()
+        other_client.force_login(self.user)
+        response = self.client.post(reverse('password_change'), {
+            'old_password': 'old-password-1',
+            'new_password1': 'new-password-2',
+            'new_password2': 'new-password-2',
+        })
+        self.assertEqual(response.status_code, 302)
+        response = other_client.get(reverse('posts:index'))
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+        response = self.client.get(reverse('posts:index'))
+        self.assertTrue(response.wsgi_request.user.is_authenticated)
+
+    def test_logout_clears_cached_user(self):
+        """Проверка, что выход убирает пользователя из кэша."""
+        self.client.get(reverse('posts:index'))
+        self.client.get(reverse('users:logout'))
+        self.assertIsNone(user_cache().get(user_cache_key(self.user.pk)))
+        response = self.client.get(reverse('posts:index'))
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+    def test_sessions_of_model_backend_stay_valid(self):
+        """Проверка, что сессии, открытые через ModelBackend, работают."""
+        self.client.force_login(
+            self.user, backend='django.contrib.auth.backends.ModelBackend'
+        )
+        response = self.client.get(reverse('posts:index'))
+        self.assertTrue(response.wsgi_request.user.is_authenticated)
+
+    def test_wrong_password_is_checked_once(self):
+        """Проверка, что неверный пароль не проверяется вторым бэкендом."""
+        with mock.patch.object(
+            User, 'check_password', autospec=True, return_value=False
+        ) as check_password:
+            user = authenticate(
+                username=self.user.username, password='wrong-password'
+            )
+        self.assertIsNone(user)
+        check_password.assert_called_once()
+
+    @override_settings(DEBUG=False)
+    def test_deploy_check_rejects_local_cache(self):
+        """Проверка, что без DEBUG кэш сессий в памяти процесса - ошибка."""
+        errors = check_shared_session_cache(None)
+        self.assertEqual(
+            [error.obj for error in errors],
+            ['SESSION_CACHE_ALIAS', 'USERS_CACHE'],
+        )
+        shared = {
+            **settings.CACHES,
+            'sessions': {
+                'BACKEND':
+                    'django.core.cache.backends.memcached.MemcachedCache',
+                'LOCATION': '127.0.0.1:11211',
+            },
+        }
+        with self.settings(CACHES=shared):
+            self.assertEqual(check_shared_session_cache(None), [])
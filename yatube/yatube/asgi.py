@@ -0,0 +1,21 @@
+"""
+ASGI config for yatube project.
+
+Django 2.2 has no ASGI support of its own, so the WSGI application is
+served through core.asgi.WsgiToAsgi: slow clients are handled by the
+event loop and views run in a bounded thread pool.
+
+    uvicorn yatube.asgi:application
+"""
+
+import os
+
+from core.asgi import WsgiToAsgi
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+
+application = WsgiToAsgi(
+    get_wsgi_application(), max_workers=settings.ASGI_WORKER_THREADS
+)
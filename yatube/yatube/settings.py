@@ -22,10 +22,20 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = 'fziia_164)ty#ri0i-04=g$be@$05nh14zq434%$*4hfq8+i&g'
 
+# продакшен-профиль с общими для процессов настройками: YATUBE_PRODUCTION=1;
+# он же выключает отладку, а с ней - все, что от нее зависит ниже
+PRODUCTION = os.environ.get('YATUBE_PRODUCTION') == '1'
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = not PRODUCTION
 
+# в продакшене - имена хостов через запятую, например
+# YATUBE_ALLOWED_HOSTS=yatube.ru,www.yatube.ru
 ALLOWED_HOSTS = []
+if PRODUCTION:
+    ALLOWED_HOSTS = list(
+        filter(None, os.environ.get('YATUBE_ALLOWED_HOSTS', '').split(','))
+    )
 
 
 # Application definition
@@ -43,6 +53,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -50,11 +61,15 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.PinPrimaryAfterWriteMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+# loaders не заданы: без отладки Django сам оборачивает их в
+# cached.Loader, и шаблоны разбираются один раз на процесс; явный
+# список зафиксировал бы выбор по DEBUG на момент импорта настроек
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -85,6 +100,109 @@ DATABASES = {
     }
 }
 
+# в продакшене соединение ждет снятия блокировки записи до 20 секунд и
+# живет между запросами одного потока
+SQLITE_PRODUCTION = {'OPTIONS': {'timeout': 20}, 'CONN_MAX_AGE': 60}
+if PRODUCTION:
+    DATABASES['default'].update(SQLITE_PRODUCTION)
+
+# прагмы SQLite для каждого нового соединения
+SQLITE_PRAGMAS = {
+    'cache_size': -20000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+# в продакшене еще WAL: читатели и писатель не блокируют друг друга.
+# Режим WAL остается в файле базы, поэтому локальную базу он не трогает
+SQLITE_PRODUCTION_PRAGMAS = {'journal_mode': 'WAL', 'synchronous': 'NORMAL'}
+if PRODUCTION:
+    SQLITE_PRAGMAS = {**SQLITE_PRODUCTION_PRAGMAS, **SQLITE_PRAGMAS}
+
+# реплики только для чтения: пути к файлам SQLite через запятую,
+# например YATUBE_READ_REPLICAS=replica1.sqlite3,replica2.sqlite3
+for number, name in enumerate(
+    filter(None, os.environ.get('YATUBE_READ_REPLICAS', '').split(',')), 1
+):
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, name),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+READ_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+# сколько секунд после записи посетитель читает с основной базы
+REPLICA_PIN_SECONDS = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+
+# в кэше posts лежат отрисованные карточки постов и их версии;
+# locmem вытесняет давно не читанные записи (LRU). Метки версий хранятся
+# без срока, иначе вместе с ними пропадали бы все зависящие от них
+# записи. locmem живет в одном процессе: новую метку видит только
+# процесс, который записал пост, поэтому locmem годится для одного
+# процесса, а с несколькими posts должен указывать на общий кэш
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'posts': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'posts',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'CULL_FREQUENCY': 10,
+        },
+    },
+    # сессии и пользователи сессий; locmem живет в одном процессе и
+    # годится только для разработки и тестов
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sessions',
+    },
+}
+# в продакшене сессии в общем для всех процессов memcached (нужен пакет
+# python-memcached); без DEBUG check --deploy не пропускает locmem
+if PRODUCTION:
+    CACHES['sessions'] = {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': os.environ.get('YATUBE_MEMCACHED', '127.0.0.1:11211'),
+        'KEY_PREFIX': 'sessions',
+    }
+
+# сессия читается из кэша и только при промахе - из django_session,
+# запись идет в кэш и в базу
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+
+# пользователь сессии берется из кэша USERS_CACHE вместо auth_user;
+# ModelBackend остается для сессий, открытых до CachedModelBackend
+AUTHENTICATION_BACKENDS = [
+    'users.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+USERS_CACHE = 'sessions'
+
+
+# первый хэшер хэширует новые пароли, остальные только проверяют старые
+# хэши; при входе старый хэш или хэш с прежними параметрами
+# пересчитывается первым хэшером. Argon2 требует пакета argon2-cffi
+PASSWORD_HASHERS = [
+    'users.hashers.ScryptPasswordHasher',
+    'users.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+# около 16 МБ памяти и 70 мс на ядро на один хэш
+PASSWORD_SCRYPT = {'work_factor': 2 ** 14, 'block_size': 8, 'parallelism': 1}
+PASSWORD_PBKDF2_ITERATIONS = 150000
+# сколько паролей хэшируется одновременно; остальные ждут в очереди.
+# Одно ядро остается запросам, которые не хэшируют пароли
+PASSWORD_HASHING_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -124,6 +242,17 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+# без DEBUG collectstatic кладет файлы с хэшем в имени, манифест и сжатые
+# копии .gz/.br; шаблоны берут имена через {% static %}
+if not DEBUG:
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+# раздавать STATIC_ROOT самим приложением, если перед ним нет прокси;
+# файлы без хэша в имени кэшируются на STATIC_MAX_AGE секунд
+STATIC_SERVE = False
+STATIC_MAX_AGE = 60 * 60
 
 #  подключаем движок filebased.EmailBackend
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
@@ -134,3 +263,65 @@ LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 
 POSTS_PER_PAGE = 10
+
+# режим пагинации лент: 'page' - по номеру страницы, 'cursor' - по курсору
+POSTS_PAGINATION_MODE = 'page'
+
+# алиас кэша для карточек постов и время их хранения в секундах
+POSTS_CACHE = 'posts'
+POSTS_CARD_TIMEOUT = 60 * 60 * 24
+
+# кэш страниц лент целиком для анонимных посетителей
+POSTS_PAGE_CACHE_ENABLED = False
+POSTS_PAGE_CACHE_TIMEOUT = 60
+
+# сколько секунд paginator лент может показывать закэшированное число постов
+POSTS_COUNT_TIMEOUT = 30
+
+# группы по slug и авторы по username в кэше процесса: до
+# POSTS_LOOKUP_CACHE_SIZE записей на POSTS_LOOKUP_CACHE_TIMEOUT секунд
+POSTS_LOOKUP_CACHE_SIZE = 1000
+POSTS_LOOKUP_CACHE_TIMEOUT = 300
+
+# JSON API лент: наибольший размер страницы ?limit= и с какого числа
+# постов ответ отдается потоком
+POSTS_API_MAX_LIMIT = 100
+POSTS_API_STREAM_AFTER = 50
+# сколько постов можно запросить за раз через api/posts/batch/
+POSTS_API_BATCH_LIMIT = 100
+
+# движок поиска постов: 'fts5' - таблица SQLite FTS5, 'python' - индекс
+# в памяти процесса (только для разработки: один процесс), 'auto' - FTS5,
+# если миграция смогла создать таблицу
+POSTS_SEARCH_BACKEND = 'auto'
+# сколько лучших id индекс в памяти передает в фильтр pk__in (поиск
+# в админке); меньше лимита переменных запроса SQLite
+POSTS_SEARCH_MAX_IDS = 500
+
+# ленты из id постов, которые пополняются при записи поста, и их длина
+POSTS_TIMELINES_ENABLED = False
+POSTS_TIMELINE_LENGTH = 1000
+POSTS_TIMELINE_TIMEOUT = 60 * 5
+
+# очередь записи новых постов: фоновый поток сохраняет их пачками до
+# POSTS_WRITE_BATCH_SIZE в одной транзакции; если очередь из
+# POSTS_WRITE_QUEUE_SIZE постов полна дольше POSTS_WRITE_QUEUE_TIMEOUT
+# секунд, пост сохраняется сразу в запросе. Очередь у каждого процесса
+# своя, и автор гарантированно видит свои посты только в том процессе,
+# который их принял: с несколькими процессами сервера включать не стоит
+POSTS_WRITE_QUEUE_ENABLED = False
+POSTS_WRITE_QUEUE_SIZE = 1000
+POSTS_WRITE_BATCH_SIZE = 100
+POSTS_WRITE_QUEUE_TIMEOUT = 2
+
+# замер SQL-запросов и времени ответа с заголовком Server-Timing;
+# перцентили считаются по последним REQUEST_TIMING_SAMPLES запросам.
+# Заголовок виден любому посетителю, поэтому по умолчанию только в отладке
+REQUEST_TIMING_ENABLED = DEBUG
+REQUEST_TIMING_SAMPLES = 1000
+
+# разбирать шаблоны проекта при запуске, а не на первых запросах
+TEMPLATES_WARM_UP = not DEBUG
+
+# потоки пула, в которых ASGI-точка входа выполняет представления
+ASGI_WORKER_THREADS = 8
@@ -1,10 +1,24 @@
+import re
+
+from core import static
+from core.views import request_timings
+from django.conf import settings
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 
 urlpatterns = [
     path('', include('posts.urls', namespace='posts')),
     path('admin/', admin.site.urls),
+    path('internal/timings/', request_timings, name='request_timings'),
     path('about/', include('about.urls', namespace='about')),
     path('auth/', include('users.urls', namespace='users')),
     path('auth/', include('django.contrib.auth.urls')),
 ]
+
+if settings.STATIC_SERVE:
+    urlpatterns += [
+        re_path(
+            r'^{}(?P<path>.*)$'.format(re.escape(settings.STATIC_URL[1:])),
+            static.serve,
+        ),
+    ]